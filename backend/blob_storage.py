@@ -1,8 +1,71 @@
 import os
 import requests
 import json
+import threading
+import time
 from typing import Optional, Dict, Any, List
 
+# Explicit (connect, read) timeouts so a hung Blob endpoint cannot block a worker
+BLOB_TIMEOUT = (
+    float(os.environ.get("BLOB_CONNECT_TIMEOUT", "3.05")),
+    float(os.environ.get("BLOB_READ_TIMEOUT", "10"))
+)
+# Consecutive failures before the circuit opens, and seconds before a trial call is allowed
+BLOB_BREAKER_THRESHOLD = int(os.environ.get("BLOB_BREAKER_THRESHOLD", "5"))
+BLOB_BREAKER_RESET = float(os.environ.get("BLOB_BREAKER_RESET", "30"))
+# Blobs per list request (the API maximum); list() follows the cursor for the rest
+BLOB_LIST_PAGE_SIZE = 1000
+
+
+class BlobStorageError(Exception):
+    """Base class for Blob storage failures."""
+
+
+class BlobUnavailableError(BlobStorageError):
+    """Blob storage is unreachable, timing out, failing, or the circuit is open. Maps to HTTP 503."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated Blob outages.
+    closed -> open after `failure_threshold` consecutive failures; after `reset_timeout`
+    one trial call is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+    def __init__(self, failure_threshold: int = BLOB_BREAKER_THRESHOLD, reset_timeout: float = BLOB_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise BlobUnavailableError("Blob storage is temporarily unavailable (circuit open)")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
 class BlobStorage:
     """
     Simple wrapper for Vercel Blob API using HTTP requests.
@@ -18,10 +81,49 @@ class BlobStorage:
             "Authorization": f"Bearer {self.token}"
         }
 
-    def put(self, filename: str, data: str, content_type: str = "application/json") -> Optional[str]:
+        # Public URLs are https://<store id>.public.blob.vercel-storage.com/<pathname>.
+        # The store id is embedded in the token: vercel_blob_rw_<store id>_<secret>
+        self.public_url = os.environ.get("BLOB_PUBLIC_URL", "").rstrip("/")
+        if not self.public_url and self.token:
+            parts = self.token.split("_")
+            if len(parts) > 4:
+                self.public_url = f"https://{parts[3].lower()}.public.blob.vercel-storage.com"
+
+        self.timeout = BLOB_TIMEOUT
+        self.breaker = CircuitBreaker()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the circuit breaker, with explicit timeouts.
+        Raises BlobUnavailableError on network errors, timeouts, 429/5xx, or an open circuit.
+        """
+        self.breaker.before_call()
+        try:
+            # SSL Verification disabled for local testing environment (self-signed cert issues)
+            resp = requests.request(method, url, timeout=self.timeout, verify=False, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            raise BlobUnavailableError(f"Blob storage request failed: {e}") from e
+
+        if resp.status_code >= 500 or resp.status_code == 429:
+            self.breaker.record_failure()
+            raise BlobUnavailableError(f"Blob storage returned HTTP {resp.status_code}")
+
+        self.breaker.record_success()
+        return resp
+
+    def url_for(self, pathname: str) -> str:
+        """Public URL of a blob stored at a fixed pathname (no random suffix)."""
+        return f"{self.public_url}/{pathname.lstrip('/')}"
+
+    def put(self, filename: str, data: str, content_type: str = "application/json",
+            add_random_suffix: bool = True, allow_overwrite: bool = False,
+            cache_max_age: Optional[int] = None) -> Optional[str]:
         """
         Upload data to Vercel Blob. 
+        Pass add_random_suffix=False (and allow_overwrite=True) for blobs that live at a fixed pathname.
         Returns the URL of the uploaded blob or None on failure.
+        Raises BlobUnavailableError if Blob storage is down.
         """
         if not self.token:
             return None
@@ -37,12 +139,21 @@ class BlobStorage:
             # Headers: x-api-key: ... (or Authorization: Bearer ...)
             
             url = f"{self.api_url}/{filename}"
-            # SSL Verification disabled for local testing environment (self-signed cert issues)
             
-            resp = requests.put(url, data=data, headers=self.headers, verify=False)
+            headers = dict(self.headers)
+            headers["x-content-type"] = content_type
+            headers["x-add-random-suffix"] = "1" if add_random_suffix else "0"
+            if allow_overwrite:
+                headers["x-allow-overwrite"] = "1"
+            if cache_max_age is not None:
+                headers["x-cache-control-max-age"] = str(cache_max_age)
+            
+            resp = self._request("PUT", url, data=data, headers=headers)
             resp.raise_for_status()
             
             return resp.json().get("url")
+        except BlobUnavailableError:
+            raise
         except Exception as e:
             print(f"Error uploading to Blob: {e}")
             # Try alternative endpoint if the above is guessed wrong. 
@@ -52,7 +163,11 @@ class BlobStorage:
             return None
 
     def list(self, prefix: str = "") -> List[Dict]:
-        """List blobs, optionally filtering by prefix."""
+        """
+        List blobs, optionally filtering by prefix. Follows the cursor across pages,
+        so the result holds every matching blob, not just the first page.
+        Raises BlobStorageError instead of returning an empty list when listing fails.
+        """
         if not self.token:
             return []
             
@@ -62,26 +177,49 @@ class BlobStorage:
             # Actually, without SDK, the API documentation is key.
             # Let's try the common endpoint: GET https://blob.vercel-storage.com?prefix=...
             
-            params = {}
+            params = {"limit": BLOB_LIST_PAGE_SIZE}
             if prefix:
                 params["prefix"] = prefix
-                
-            resp = requests.get(url, headers=self.headers, params=params, verify=False)
-            resp.raise_for_status()
-            
-            # Response: { "blobs": [ ... ], "hasMore": ... }
-            return resp.json().get("blobs", [])
-        except Exception as e:
-            print(f"Error listing blobs: {e}")
-            return resp.json().get("blobs", [])
+
+            blobs = []
+            while True:
+                resp = self._request("GET", url, headers=self.headers, params=params)
+                resp.raise_for_status()
+
+                # Response: { "blobs": [ ... ], "cursor": ..., "hasMore": ... }
+                page = resp.json()
+                blobs.extend(page.get("blobs", []))
+                if not page.get("hasMore") or not page.get("cursor"):
+                    return blobs
+                params["cursor"] = page["cursor"]
+        except BlobUnavailableError:
+            # Never report an outage as "no blobs"
+            raise
         except Exception as e:
             print(f"Error listing blobs: {e}")
-            return []
+            raise BlobStorageError(f"Could not list blobs: {e}") from e
 
     def head(self, url: str) -> Optional[Dict]:
-        """Get metadata for a blob."""
-        # Not strictly needed if we just list, but good for checking existence by exact URL
-        pass 
+        """
+        Get metadata for a blob by URL or pathname without downloading it.
+        Returns None if the blob does not exist; raises BlobStorageError if it cannot tell.
+        """
+        if not self.token:
+            return None
+        if not url.startswith("http"):
+            url = self.url_for(url)
+        try:
+            resp = self._request("GET", self.api_url, headers=self.headers, params={"url": url})
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            return resp.json()
+        except BlobUnavailableError:
+            raise
+        except Exception as e:
+            # Only a 404 means "does not exist"; anything else must not look like a miss
+            print(f"Error reading blob metadata {url}: {e}")
+            raise BlobStorageError(f"Could not read blob metadata: {e}") from e
 
     def delete(self, url: str) -> bool:
         """Delete a blob by URL."""
@@ -89,21 +227,38 @@ class BlobStorage:
         try:
             # POST /delete with json body: { urls: [url] }
             delete_url = f"{self.api_url}/delete"
-            resp = requests.post(delete_url, headers=self.headers, json={"urls": [url]}, verify=False)
+            resp = self._request("POST", delete_url, headers=self.headers, json={"urls": [url]})
             resp.raise_for_status()
             return True
+        except BlobUnavailableError:
+            raise
         except Exception as e:
             print(f"Error deleting blob: {e}")
             return False
 
+    def delete_many(self, urls: List[str]) -> bool:
+        """Delete several blobs in one request (the delete endpoint takes a list of URLs)."""
+        if not self.token: return False
+        if not urls: return True
+        try:
+            delete_url = f"{self.api_url}/delete"
+            resp = self._request("POST", delete_url, headers=self.headers, json={"urls": list(urls)})
+            resp.raise_for_status()
+            return True
+        except BlobUnavailableError:
+            raise
+        except Exception as e:
+            print(f"Error deleting blobs: {e}")
+            return False
+
     def get_json(self, url: str) -> Optional[Any]:
         """Download and parse JSON from a Blob URL."""
         try:
-            # SSL Verification disabled for local testing
-            resp = requests.get(url, headers=self.headers, verify=False)
-            resp.raise_for_status()
+            resp = self._request("GET", url, headers=self.headers)
             resp.raise_for_status()
             return resp.json()
+        except BlobUnavailableError:
+            raise
         except Exception as e:
             print(f"Error reading blob {url}: {e}")
             return None
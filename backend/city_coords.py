@@ -1,3 +1,10 @@
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from backend.location_normalizer import normalize_location
+from backend.search_index import fold
+
 CITY_COORDINATES = {   
 "amsterdam": [52.3676, 4.9041],
 "bangalore": [12.9716, 77.5946],
@@ -69,45 +76,38 @@ CITY_COORDINATES = {
 "italy": [41.8719, 12.5674],
 "goa": [15.2993, 74.1240]
 }
+# Lookup tables over accent/case-folded names, compiled once
+_FOLDED_COORDINATES = {fold(k): tuple(v) for k, v in CITY_COORDINATES.items()}
+_CITY_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(_FOLDED_COORDINATES, key=len, reverse=True)) + r")\b"
+)
+
+
+@lru_cache(maxsize=4096)
+def _lookup(location_string: str) -> Optional[Tuple[float, float]]:
+    loc = normalize_location(location_string)
+
+    # 1. Exact matches, most specific first
+    for part in (loc.city, loc.venue, loc.country):
+        coords = _FOLDED_COORDINATES.get(fold(part)) if part else None
+        if coords:
+            return coords
+
+    # 2. Known city names inside a part (e.g. "OLYMPIA LONDON")
+    for part in (loc.city, loc.venue, loc.country):
+        if len(part) < 3: continue
+        match = _CITY_PATTERN.search(fold(part))
+        if match:
+            return _FOLDED_COORDINATES[match.group(1)]
+    return None
+
+
 def get_coordinates(location_string: str):
     """
     Get coordinates for a location string.
-    Tries to match against known cities with improved precision.
+    Parses it with the shared location normaliser, then matches known cities.
     """
     if not location_string:
         return None
-    
-    # Normalize input
-    loc_lower = location_string.lower().strip()
-    loc_lower = loc_lower.rstrip('.')
-    
-    # Handle separators: often city is after a pipe or comma
-    # e.g. "Chancery Pavilion Hotel | Bangalore, India"
-    # We should try to extract the city part.
-    parts = []
-    if '|' in loc_lower:
-        parts.extend([p.strip() for p in loc_lower.split('|')])
-    elif ',' in loc_lower:
-        parts.extend([p.strip() for p in loc_lower.split(',')])
-    else:
-        parts.append(loc_lower)
-
-    # 1. Exact matches on any part
-    for part in reversed(parts):
-        # Clean comma from part if present for dictionary matching
-        p_clean = part.replace(',', '').strip()
-        if p_clean in CITY_COORDINATES:
-            lat, lng = CITY_COORDINATES[p_clean]
-            return {"lat": lat, "lng": lng}
-
-    # 2. Fuzzy containment check with word boundaries
-    for part in reversed(parts):
-        if len(part) < 3: continue
-        p_clean = part.replace(',', '').strip()
-        for key, coords in CITY_COORDINATES.items():
-            # If key is inside part (e.g. key is "bangalore", part is "bangalore india")
-            import re
-            if re.search(rf'\b{re.escape(key)}\b', p_clean):
-                return {"lat": coords[0], "lng": coords[1]}
-    
-    return None
\ No newline at end of file
+    coords = _lookup(location_string)
+    return {"lat": coords[0], "lng": coords[1]} if coords else None
@@ -1,11 +1,16 @@
 import pandas as pd
+import io
 import json
 import os
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, timezone
+import hashlib
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import re
 
 # Use absolute path relative to this file
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,12 +24,50 @@ if IS_VERCEL:
 else:
     STORAGE_DIR = os.path.join(BASE_DIR, "storage")
 
-from backend.blob_storage import BlobStorage
+from backend.blob_storage import BlobStorage, BlobStorageError, BlobUnavailableError
+from backend.geo_cluster import GeoClusterIndex, parse_bbox
+from backend.geo_index import SpatialIndex
+from backend.recommender import Recommender
+from backend.timeline_index import TimelineIndex, parse_quarter
+from backend.search_index import SearchIndex, SUGGEST_FIELDS, fold
+from backend.ics_feed import filter_events, render_calendar
+from backend.single_flight import SingleFlight
+from backend.shared_snapshot import SharedSnapshot
+from backend.interest_cube import InterestCube, DIMENSIONS, parse_fee
+from backend.excel_ingest import generate_id, parse_sheet, parse_workbooks, unparsed_dates
+from backend.location_normalizer import location_key, normalize_location
 
 DATA_FILE = os.path.join(STORAGE_DIR, "events.json")
+# Event-set version and the changelog of recent uploads (for delta sync)
+CHANGES_FILE = os.path.join(STORAGE_DIR, "events_changes.json")
 # INTERESTS_FILE removed in favor of Blob
 SEED_DATA_FILE = os.path.join(BASE_DIR, "storage", "events.json")
 BLOB_INTERESTS_KEY = "user_interests.json"
+# Interests are sharded per event: interests/<event shard>/interest-<suffix>.json
+INTERESTS_PREFIX = "interests/"
+# Pathname of an interest already at its content-addressed key: interests/<slug>-<10 hex>/<32 hex>.json
+_INTEREST_KEY_RE = re.compile(r"^interests/[a-z0-9-]+-[0-9a-f]{10}/[0-9a-f]{32}\.json$")
+
+# Published event sets: immutable content-addressed snapshots plus a small pointer blob
+EVENTS_SNAPSHOT_PREFIX = "events/snapshots/"
+EVENTS_POINTER_KEY = "events/current.json"
+# How often (seconds) an instance checks the pointer for a newer event set
+EVENTS_SYNC_INTERVAL = int(os.environ.get("EVENTS_SYNC_INTERVAL", "30"))
+# Number of event-set changes kept for /api/events/changes; older clients refetch fully
+CHANGELOG_SIZE = 50
+# Multi-worker mode (uvicorn --workers N / gunicorn): share the event set through a memory-mapped snapshot
+SHARED_SNAPSHOT = os.environ.get("SHARED_SNAPSHOT", "").lower() in ("1", "true", "yes")
+# How long (seconds) a full interest scan is reused by admin reads; writes invalidate it
+INTERESTS_CACHE_TTL = float(os.environ.get("INTERESTS_CACHE_TTL", "15"))
+# Max age (seconds) of the interest analytics cube before a full rebuild; local writes
+# update it incrementally, this bounds staleness from writes on other instances
+INTERESTS_CUBE_MAX_AGE = float(os.environ.get("INTERESTS_CUBE_MAX_AGE", "300"))
+# Admin bulk operations: row limit, concurrent blob requests, URLs per delete request
+BULK_MAX_ROWS = int(os.environ.get("BULK_MAX_ROWS", "5000"))
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", "8"))
+BULK_DELETE_BATCH = 100
+# Number of rendered calendar feeds kept per event-set version
+ICS_CACHE_SIZE = 256
 
 class DataManager:
     def __init__(self):
@@ -33,37 +76,169 @@ class DataManager:
         self.geocache = {}  # Cache to avoid repeated API calls
         
         self.blob_storage = BlobStorage()
+
+        # Monotonic event-set version, bumped whenever an upload changes the events,
+        # plus a bounded log of which ids each version added/updated/removed.
+        # The changelog file also records a digest of the events it describes.
+        self.events_version = 1
+        self.changelog: List[Dict] = []
+        self._changelog_digest: Optional[str] = None
+        self._load_changelog()
+        self.cluster_index = GeoClusterIndex()
+        self.spatial_index = SpatialIndex()
+        self.search_index = SearchIndex()
+        self.recommender = Recommender()
+        self.timeline = TimelineIndex()
+        self.events_updated_at = datetime.now(timezone.utc)
+        # (topic, country, quarter) -> rendered feed for the current event set
+        self.ics_cache: Dict[tuple, Dict] = {}
+
+        # Cross-instance sync state (see sync_events / publish_snapshot)
+        self.snapshot_version: Optional[str] = None
+        self._pointer_stamp: Optional[str] = None
+        self._last_sync_check = 0.0
+        self._sync_lock = threading.Lock()
+        # Digest of the events file shipped with this deploy, recorded in published pointers
+        self.seed_digest = self._seed_digest()
+        self._seed_checked = False
+
+        # Coalesces concurrent expensive interest reads (admin dashboards)
+        self.interest_reads = SingleFlight()
+        self.interest_cube = InterestCube()
+        # Last successful full interest scan, served read-only while Blob is down
+        self._last_good_interests: Optional[List[Dict]] = None
+        self._last_good_interests_at: Optional[datetime] = None
+        self._serving_stale_interests = False
         
         # On Vercel, seed the /tmp/storage if it's empty
         if IS_VERCEL and not os.path.exists(DATA_FILE) and os.path.exists(SEED_DATA_FILE):
              import shutil
              shutil.copy2(SEED_DATA_FILE, DATA_FILE)
-             
-        self.load_data()
+
+        self.shared_snapshot = SharedSnapshot(STORAGE_DIR) if SHARED_SNAPSHOT else None
+        if self.shared_snapshot:
+            self._load_shared()
+        else:
+            self.load_data()
+
+    def _interest_shard(self, event_name: str) -> str:
+        """Blob prefix holding all interests of one event, e.g. 'interests/cigre-paris-session-2026-1a2b3c4d5e/'."""
+        name = str(event_name or "").strip()
+        slug = re.sub(r"[^a-z0-9]+", "-", fold(name))[:40].strip("-") or "event"
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:10]
+        return f"{INTERESTS_PREFIX}{slug}-{digest}/"
+
+    def _interest_key(self, event_name: str, event_id: str, email: str) -> str:
+        """Deterministic blob pathname of one user's interest in one event."""
+        digest = hashlib.sha256(f"{event_id}|{email.strip().lower()}".encode("utf-8")).hexdigest()[:32]
+        return f"{self._interest_shard(event_name)}{digest}.json"
+
+    def _interest_key_for_record(self, record: Dict) -> str:
+        event_name = record.get("eventName", "")
+        event_id = record.get("eventId")
+        if not event_id:
+            # Older records only carry the event name
+            event = next((e for e in self.events if e.get("eventName") == event_name), None)
+            event_id = event["id"] if event else event_name
+        return self._interest_key(event_name, event_id, str(record.get("email", "")))
+
+    def _fetch_raw_interest_blobs(self, prefix: str = "interests") -> List[Dict]:
+        """Fetch interest records under a prefix, each with its blob '_url' attached."""
+        blobs = self.blob_storage.list(prefix=prefix)
+        records = []
+
+        for b in blobs:
+            # Double check path if needed
+            if "interests" not in b.get("pathname", ""):
+                continue
+
+            url = b.get("url")
+            data = self.blob_storage.get_json(url)
+            if data:
+                if isinstance(data, list):
+                    records.extend({**d, "_url": url} for d in data if isinstance(d, dict))
+                elif isinstance(data, dict):
+                    records.append({**data, "_url": url})
+        return records
 
     def _fetch_all_raw_interests(self) -> List[Dict]:
-        """Helper to fetch all individual interest blobs."""
-        try:
+        """
+        Helper to fetch all individual interest blobs.
+        Concurrent callers share one scan, and the result is reused for INTERESTS_CACHE_TTL seconds.
+        """
+        def scan():
             # Relaxed prefix to 'interests' generally
+            return [{k: v for k, v in r.items() if k != "_url"} for r in self._fetch_raw_interest_blobs()]
+
+        try:
+            records = self.interest_reads.do("raw_interests", scan, ttl=INTERESTS_CACHE_TTL)
+            self._last_good_interests = records
+            self._last_good_interests_at = datetime.now(timezone.utc)
+            self._serving_stale_interests = False
+            return records
+        except BlobUnavailableError:
+            # Degraded read-only mode: admin reads get the last good snapshot
+            if self._last_good_interests is None:
+                raise
+            self._serving_stale_interests = True
+            return self._last_good_interests
+
+    def degraded_status(self) -> Optional[Dict]:
+        """Describes degraded mode when admin reads are served from the last good snapshot."""
+        if not (self._serving_stale_interests or self.blob_storage.breaker.is_open):
+            return None
+        at = self._last_good_interests_at
+        return {"snapshotAt": at.strftime("%Y-%m-%dT%H:%M:%SZ") if at else None}
+
+    def migrate_interest_layout(self) -> Dict:
+        """
+        One-time migration of existing interest blobs (flat 'interests/interest*.json' or
+        randomly suffixed names) to their per-event, content-addressed keys.
+        Safe to re-run: blobs already at a key are recognised by pathname and not downloaded.
+        Records without an eventId whose event no longer exists are left in place and
+        counted as skipped: there is no real key that save or remove could find them under.
+        """
+        try:
             blobs = self.blob_storage.list(prefix="interests")
-            all_interests = []
-            
+            by_name = {e.get("eventName"): e["id"] for e in self.events}
+            moved, skipped = 0, 0
+
             for b in blobs:
-                # Double check path if needed
-                if "interests" not in b.get("pathname", ""):
+                pathname = b.get("pathname", "")
+                if _INTEREST_KEY_RE.match(pathname):
                     continue
-                    
                 url = b.get("url")
                 data = self.blob_storage.get_json(url)
-                if data:
-                    if isinstance(data, list):
-                        all_interests.extend(data)
-                    elif isinstance(data, dict):
-                        all_interests.append(data)
-            return all_interests
+                records = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+                records = [r for r in records if isinstance(r, dict)]
+                if not records:
+                    skipped += 1
+                    continue
+
+                event_ids = [r.get("eventId") or by_name.get(r.get("eventName")) for r in records]
+                if not all(event_ids):
+                    skipped += 1
+                    continue
+
+                uploaded = all(
+                    self.blob_storage.put(self._interest_key(r.get("eventName", ""), event_id, str(r.get("email", ""))),
+                                          json.dumps({**r, "eventId": event_id}, indent=2),
+                                          add_random_suffix=False, allow_overwrite=True)
+                    for r, event_id in zip(records, event_ids)
+                )
+                if uploaded and self.blob_storage.delete(url):
+                    moved += 1
+                else:
+                    skipped += 1
+
+            self.interest_reads.invalidate()
+            self.interest_cube.invalidate()
+            return {"status": "success", "message": f"Migrated {moved} interest blobs ({skipped} skipped)."}
+        except BlobStorageError:
+            raise
         except Exception as e:
-            print(f"Error fetching raw interests: {e}")
-            return []
+            print(f"Error migrating interests: {e}")
+            return {"status": "error", "message": str(e)}
 
     def save_interest(self, user_data: Dict) -> Dict:
         """
@@ -77,60 +252,57 @@ class DataManager:
             if not event:
                 return {"status": "error", "message": "Event not found"}
 
-            event_price = event.get("price", "TBD")
-            email = user_data.get("email", "").strip().lower()
-
             # 1.5 Domain Validation
-            if not email.endswith("@bakerhughes.com"):
-                return {"status": "error", "message": "Access restricted. Please use a valid BH email address."}
-
-            record = {
-                "firstName": user_data.get("firstName"),
-                "lastName": user_data.get("lastName"),
-                "username": user_data.get("username"),
-                "email": email,
-                "role": user_data.get("role"),
-                "city": user_data.get("city"),
-                "country": user_data.get("country"),
-                "topic": event.get("topic"),
-                "eventName": event.get("eventName"),
-                "eventPrice": event_price,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            record, error = self._build_interest_record(user_data, event)
+            if error:
+                return {"status": "error", "message": error}
 
-            # 2. Duplicate Check (Requires fetching all)
-            existing_data = self._fetch_all_raw_interests()
-            
-            is_duplicate = False
-            for entry in existing_data:
-                same_event = entry.get("eventName") == record["eventName"]
-                same_user = (entry.get("email") == record["email"]) or (entry.get("username") == record["username"])
-                if same_event and same_user:
-                    is_duplicate = True
-                    break
-
-            if is_duplicate:
+            # 2. Duplicate Check: one metadata request on the deterministic key
+            key = self._interest_key(record["eventName"], event_id, record["email"])
+            if self.blob_storage.head(key):
                 return {"status": "error", "message": "You have already registered interest for this event."}
 
-            # 3. Save as NEW Blob (Single Object)
-            # Vercel Blob will add a random suffix ensuring uniqueness if we don't overwrite
-            try:
-                # We save just the dict, or a list of one dict? User said "blobs for every interests".
-                # Standard is usually storing the object itself.
-                self.blob_storage.put("interests/interest.json", json.dumps(record, indent=2))
-            except Exception as e:
-                print(f"Failed to upload to blob: {e}")
-                raise e
+            # 3. Save as NEW Blob (Single Object) at its key; no overwrite so a racing duplicate fails
+            url = self.blob_storage.put(key, json.dumps(record, indent=2),
+                                        add_random_suffix=False, allow_overwrite=False)
+            self.interest_reads.invalidate()
+            if not url:
+                return {"status": "error", "message": "Could not save interest. Please try again."}
+            self.interest_cube.add(record, key=key)
 
             return {"status": "success", "message": "Interest registered successfully!"}
 
+        except BlobStorageError:
+            raise
         except Exception as e:
             print(f"Error saving interest: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _build_interest_record(self, user_data: Dict, event: Dict):
+        """Validate a registration and build its stored record. Returns (record, error message)."""
+        email = str(user_data.get("email") or "").strip().lower()
+        if not email.endswith("@bakerhughes.com"):
+            return None, "Access restricted. Please use a valid BH email address."
+
+        return {
+            "firstName": user_data.get("firstName"),
+            "lastName": user_data.get("lastName"),
+            "username": user_data.get("username"),
+            "email": email,
+            "role": user_data.get("role"),
+            "city": user_data.get("city"),
+            "country": user_data.get("country"),
+            "topic": event.get("topic"),
+            "eventName": event.get("eventName"),
+            "eventPrice": event.get("price", "TBD"),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "eventId": event["id"]
+        }, None
+
     def remove_interest(self, event_id: str, email: str) -> Dict:
         """
-        Remove user interest by deleting the corresponding blob.
+        Remove user interest with one delete at its deterministic key: nothing is listed or
+        downloaded. Deleting a key that does not exist succeeds, so removal is idempotent.
         """
         try:
             # 1. Get Event Name
@@ -138,34 +310,18 @@ class DataManager:
             if not event:
                 return {"status": "error", "message": "Event not found"}
             
-            target_event_name = event.get("eventName")
-            target_email = email.strip().lower()
-
-            # 2. Find and Delete the Blob
-            blobs = self.blob_storage.list(prefix="interests")
-            deleted_count = 0
-            
-            for b in blobs:
-                url = b.get("url")
-                # We need to fetch the JSON to verify the email and eventName
-                # because Vercel Blob listing doesn't show custom metadata easily in list
-                data = self.blob_storage.get_json(url)
-                
-                if data and isinstance(data, dict):
-                    blob_email = str(data.get("email", "")).strip().lower()
-                    blob_event = data.get("eventName")
-                    
-                    if blob_email == target_email and blob_event == target_event_name:
-                        # Match found! Delete it.
-                        success = self.blob_storage.delete(url)
-                        if success:
-                            deleted_count += 1
-
-            if deleted_count > 0:
+            # 2. Delete the Blob at its deterministic key
+            key = self._interest_key(event.get("eventName"), event_id, email)
+            deleted = self.blob_storage.delete(self.blob_storage.url_for(key))
+            self.interest_reads.invalidate()
+            if deleted:
+                # The cube remembers what the key counted for
+                self.interest_cube.discard(key)
                 return {"status": "success", "message": f"Interest removed successfully."}
-            else:
-                return {"status": "error", "message": "No matching interest found to remove."}
+            return {"status": "error", "message": "Could not remove interest. Please try again."}
 
+        except BlobStorageError:
+            raise
         except Exception as e:
             print(f"Error removing interest: {e}")
             return {"status": "error", "message": str(e)}
@@ -175,7 +331,7 @@ class DataManager:
         Remove ALL interests for a specific event (Admin function).
         """
         try:
-            blobs = self.blob_storage.list(prefix="interests")
+            blobs = self.blob_storage.list(prefix=self._interest_shard(event_name))
             deleted_count = 0
             
             for b in blobs:
@@ -187,13 +343,159 @@ class DataManager:
                         success = self.blob_storage.delete(url)
                         if success:
                             deleted_count += 1
+                            self.interest_cube.remove(data, key=self._interest_key_for_record(data))
 
+            self.interest_reads.invalidate()
             return {"status": "success", "message": f"Successfully removed {deleted_count} interests for '{event_name}'."}
 
+        except BlobStorageError:
+            raise
         except Exception as e:
             print(f"Error clearing event interests: {e}")
             return {"status": "error", "message": str(e)}
 
+    def _existing_interest_keys(self) -> set:
+        """Pathnames of all interest blobs: one paginated listing, nothing downloaded."""
+        return {b.get("pathname") for b in self.blob_storage.list(prefix=INTERESTS_PREFIX)}
+
+    def bulk_save_interests(self, rows: List[Dict]) -> Dict:
+        """
+        Register many interests at once (admin import). Rows are validated and deduplicated
+        against existing interests and each other in one pass, then written concurrently.
+        Returns a per-row report.
+        """
+        if len(rows) > BULK_MAX_ROWS:
+            return {"status": "error", "message": f"Too many rows ({len(rows)}); the limit is {BULK_MAX_ROWS}."}
+
+        by_id = {e["id"]: e for e in self.events}
+        by_name = {e.get("eventName"): e for e in self.events}
+        existing = self._existing_interest_keys()
+
+        report = []
+        pending = []  # (report entry, key, record)
+        seen = set()
+        for number, row in enumerate(rows, start=1):
+            entry = {"row": number, "email": row.get("email", ""), "eventId": row.get("eventId", "")}
+            report.append(entry)
+
+            event = by_id.get(row.get("eventId")) or by_name.get(row.get("eventName"))
+            if not event:
+                entry.update(status="error", message="Event not found")
+                continue
+            entry["eventId"] = event["id"]
+
+            record, error = self._build_interest_record(row, event)
+            if error:
+                entry.update(status="error", message=error)
+                continue
+
+            key = self._interest_key(record["eventName"], event["id"], record["email"])
+            if key in existing or key in seen:
+                entry.update(status="duplicate", message="Interest already registered for this event.")
+                continue
+            seen.add(key)
+            pending.append((entry, key, record))
+
+        def write(item):
+            entry, key, record = item
+            try:
+                url = self.blob_storage.put(key, json.dumps(record, indent=2),
+                                            add_random_suffix=False, allow_overwrite=False)
+            except BlobStorageError as e:
+                url, entry["message"] = None, str(e)
+            if url:
+                entry.update(status="created")
+            else:
+                entry.setdefault("message", "Could not save interest.")
+                entry["status"] = "error"
+            return url
+
+        with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as pool:
+            written = list(pool.map(write, pending))
+
+        self.interest_reads.invalidate()
+        for (_, key, record), url in zip(pending, written):
+            if url:
+                self.interest_cube.add(record, key=key)
+
+        return {"status": "success", "summary": self._bulk_summary(report), "rows": report}
+
+    def bulk_remove_interests(self, removals: List[Dict]) -> Dict:
+        """
+        Remove many (eventId, email) interests at once. Each row maps to its deterministic
+        blob key, so no scan is needed: the keys are checked concurrently with head() and
+        the matches deleted in batched delete requests. Returns a per-row report.
+        """
+        if len(removals) > BULK_MAX_ROWS:
+            return {"status": "error", "message": f"Too many rows ({len(removals)}); the limit is {BULK_MAX_ROWS}."}
+
+        by_id = {e["id"]: e for e in self.events}
+
+        report = []
+        targets: Dict[str, List[Dict]] = {}  # key -> report entries
+        for number, item in enumerate(removals, start=1):
+            event_id = str(item.get("eventId") or "")
+            email = str(item.get("email") or "").strip().lower()
+            entry = {"row": number, "email": email, "eventId": event_id}
+            report.append(entry)
+
+            event = by_id.get(event_id)
+            key = self._interest_key(event.get("eventName") if event else event_id, event_id, email)
+            targets.setdefault(key, []).append(entry)
+
+        def lookup(key):
+            # head() decides existence: a CDN read of a just-deleted blob can still succeed
+            try:
+                return self.blob_storage.head(key), ""
+            except BlobStorageError as e:
+                return None, str(e)
+
+        with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as pool:
+            found = dict(zip(targets, pool.map(lookup, targets)))
+
+        urls = {}  # url -> key
+        for key, (meta, error) in found.items():
+            if meta:
+                urls[meta.get("url") or self.blob_storage.url_for(key)] = key
+                continue
+            for entry in targets[key]:
+                if error:
+                    entry.update(status="error", message=error)
+                else:
+                    entry.update(status="not_found", message="No matching interest found.")
+
+        batch_urls = list(urls)
+        batches = [batch_urls[i:i + BULK_DELETE_BATCH] for i in range(0, len(batch_urls), BULK_DELETE_BATCH)]
+
+        def delete(batch):
+            try:
+                return self.blob_storage.delete_many(batch), ""
+            except BlobStorageError as e:
+                return False, str(e)
+
+        with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as pool:
+            outcomes = list(pool.map(delete, batches))
+
+        self.interest_reads.invalidate()
+        for batch, (deleted, error) in zip(batches, outcomes):
+            for url in batch:
+                if deleted:
+                    self.interest_cube.discard(urls[url])
+                for entry in targets[urls[url]]:
+                    if deleted:
+                        entry.update(status="removed")
+                    else:
+                        entry.update(status="error", message=error or "Could not remove interest.")
+
+        return {"status": "success", "summary": self._bulk_summary(report), "rows": report}
+
+    @staticmethod
+    def _bulk_summary(report: List[Dict]) -> Dict[str, int]:
+        summary = {"total": len(report)}
+        for entry in report:
+            summary[entry["status"]] = summary.get(entry["status"], 0) + 1
+        return summary
+
     def get_interests(self) -> List[Dict]:
         """
         Fetch all interests and AGGREGATE them for Admin Dashboard.
@@ -210,13 +512,7 @@ class DataManager:
             
             for item in raw_data:
                 event_name = item.get("eventName", "Unknown")
-                price_str = str(item.get("eventPrice", "0")).replace("$", "").replace(",", "")
-                
-                # Parse price
-                try:
-                    price = float(price_str) if price_str.lower() != "tbd" else 0
-                except:
-                    price = 0
+                price = parse_fee(item.get("eventPrice", "0"))
                     
                 key = (event_name, item.get("eventPrice", "TBD"))
                 
@@ -240,10 +536,42 @@ class DataManager:
                 })
                 
             return results
+        except BlobStorageError:
+            raise
         except Exception as e:
             print(f"Error fetching interests from blob: {e}")
             return []
     
+    def get_interest_analytics(self, group_by: str = "") -> Dict:
+        """
+        Interest counts and fee totals grouped by any of topic, country, role, month.
+        Answered from the precomputed cube; a full scan only happens when it is missing or too old.
+        """
+        dims = [d.strip() for d in group_by.split(",") if d.strip()]
+        invalid = [d for d in dims if d not in DIMENSIONS]
+        if invalid:
+            return {"status": "error", "message": f"Unknown group_by: {', '.join(invalid)}. Use: {', '.join(DIMENSIONS)}"}
+
+        cube = self._fresh_interest_cube()
+        result = cube.query(list(dict.fromkeys(dims)))
+        result["builtAt"] = datetime.fromtimestamp(cube.built_at or 0, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        result["stale"] = cube.stale
+        return result
+
+    def _fresh_interest_cube(self) -> InterestCube:
+        """The interest cube, rebuilt by a full scan only when it is missing or too old."""
+        cube = self.interest_cube
+        # While Blob is down keep answering from the existing cube instead of rescanning
+        degraded = self.blob_storage.breaker.is_open and cube.ready
+        if not degraded and (not cube.ready or cube.stale or cube.age() > INTERESTS_CUBE_MAX_AGE):
+            def rebuild():
+                writes = cube.write_count
+                records = self._fetch_all_raw_interests()
+                keys = [self._interest_key_for_record(r) for r in records]
+                cube.build(records, writes_at_start=writes, keys=keys)
+            self.interest_reads.do("interest_cube", rebuild)
+        return cube
+
     # get_interests_file removed as we generate on fly now
 
     def load_data(self):
@@ -276,19 +604,303 @@ class DataManager:
         else:
             self.events = []
 
+        if self._snapshot_hash(self.events) != self._changelog_digest:
+            # events.json is not the set the stored version describes (fresh instance,
+            # redeploy with an edited seed): never reuse a version number for it
+            self._new_version_base()
+        self._on_events_changed()
+
+    def _new_version_base(self, floor: int = 0):
+        """
+        Start a new version, with an empty changelog, for events whose history is unknown.
+        Seeded from the clock so versions stay unique across instances and redeploys;
+        clients holding any earlier version refetch fully.
+        """
+        self.events_version = max(self.events_version + 1, floor + 1, int(time.time()))
+        self.changelog = []
+        self._save_changelog()
+
+    def _load_shared(self):
+        """
+        Multi-worker startup: the first worker parses, dedupes and cleans events.json and
+        publishes the shared snapshot; the others map it and only parse the cleaned events
+        for their own indexes.
+        """
+        with self.shared_snapshot.lock():
+            loaded = self.shared_snapshot.load()
+            # Republish if events.json was replaced since the snapshot (e.g. a new deploy)
+            if loaded is None or loaded[1].get("source_mtime", 0) < self._data_file_mtime():
+                self.load_data()
+                self._publish_shared()
+                return
+        events, meta = loaded
+        self._adopt_event_set(events, meta.get("version"), meta.get("changelog"), persist=False)
+
+    def _data_file_mtime(self) -> float:
+        return os.path.getmtime(DATA_FILE) if os.path.exists(DATA_FILE) else 0.0
+
+    def shared_changed(self) -> bool:
+        """True if another worker published an event set this worker has not picked up yet."""
+        return bool(self.shared_snapshot) and self.shared_snapshot.changed()
+
+    def refresh_shared(self) -> bool:
+        """Pick up an event set published by another worker. Costs one memory read when unchanged."""
+        if not self.shared_snapshot or not self.shared_snapshot.changed():
+            return False
+        loaded = self.shared_snapshot.load()
+        if loaded is None:
+            return False
+        events, meta = loaded
+        # The publishing worker already persisted the changelog in the shared storage dir
+        self._adopt_event_set(events, meta.get("version"), meta.get("changelog"), persist=False)
+        return True
+
+    def _publish_shared(self):
+        """Make this worker's event set visible to the other workers."""
+        if self.shared_snapshot:
+            self.shared_snapshot.publish(self.events, {
+                "source_mtime": self._data_file_mtime(),
+                "version": self.events_version,
+                "changelog": self.changelog
+            })
+
+    def get_events_payload(self) -> Optional[memoryview]:
+        """Pre-serialised events JSON, a view of the shared snapshot (multi-worker mode only)."""
+        if not self.shared_snapshot:
+            return None
+        return self.shared_snapshot.payload()
+
+    def _load_changelog(self):
+        if not os.path.exists(CHANGES_FILE):
+            return
+        try:
+            with open(CHANGES_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.events_version = int(data.get("version", 1))
+            self.changelog = data.get("changelog", [])[-CHANGELOG_SIZE:]
+            self._changelog_digest = data.get("digest")
+        except Exception as e:
+            print(f"Error loading event changelog: {e}")
+
+    def _save_changelog(self):
+        os.makedirs(os.path.dirname(CHANGES_FILE), exist_ok=True)
+        self._changelog_digest = self._snapshot_hash(self.events)
+        tmp_path = f"{CHANGES_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.events_version, "changelog": self.changelog,
+                       "digest": self._changelog_digest}, f)
+        os.replace(tmp_path, CHANGES_FILE)
+
+    def _record_change(self, previous: Dict[str, Dict]):
+        """Diff the current events against `previous` (id -> event) and log a new version."""
+        current = {e["id"]: e for e in self.events}
+        added = [i for i in current if i not in previous]
+        removed = [i for i in previous if i not in current]
+        updated = [i for i, e in current.items() if i in previous and previous[i] != e]
+        if not (added or removed or updated):
+            return
+
+        self.events_version += 1
+        self.changelog.append({
+            "version": self.events_version,
+            "added": added,
+            "updated": updated,
+            "removed": removed
+        })
+        self.changelog = self.changelog[-CHANGELOG_SIZE:]
+        self._save_changelog()
+
+    def _adopt_event_set(self, events: List[Dict], version: Optional[int], changelog: Optional[List[Dict]],
+                         persist: bool = True):
+        """Replace the events with a set published elsewhere, keeping its version and changelog."""
+        if version is None:
+            # Publisher did not carry a version: derive the change locally
+            previous = {e["id"]: e for e in self.events}
+            self.events = events
+            self._record_change(previous)
+        else:
+            self.events = events
+            self.events_version = int(version)
+            self.changelog = (changelog or [])[-CHANGELOG_SIZE:]
+            if persist:
+                self._save_changelog()
+        self._on_events_changed()
+
+    def get_event_changes(self, since: int) -> Dict:
+        """
+        Delta between event-set version `since` and the current one.
+        Returns { version, full: True } when `since` is outside the changelog window.
+        """
+        base = self.changelog[0]["version"] - 1 if self.changelog else self.events_version
+        if since < base or since > self.events_version:
+            return {"version": self.events_version, "full": True}
+
+        added, updated, removed = set(), set(), set()
+        for entry in self.changelog:
+            if entry["version"] <= since:
+                continue
+            for i in entry.get("added", []):
+                added.add(i)
+                removed.discard(i)
+            for i in entry.get("updated", []):
+                if i not in added:
+                    updated.add(i)
+            for i in entry.get("removed", []):
+                updated.discard(i)
+                if i in added:
+                    added.discard(i)  # added and removed within the window: net no change
+                else:
+                    removed.add(i)
+
+        by_id = {e["id"]: e for e in self.events}
+        return {
+            "version": self.events_version,
+            "full": False,
+            "added": [by_id[i] for i in sorted(added) if i in by_id],
+            "updated": [by_id[i] for i in sorted(updated) if i in by_id],
+            "removed": sorted(i for i in removed if i not in by_id)
+        }
+
+    def _on_events_changed(self):
+        """Rebuild indexes derived from the events after any change to the event set."""
+        self.cluster_index.build(self.events, self.events_version)
+        self.spatial_index.build(self.events, self.events_version)
+        self.search_index.build(self.events, self.events_version)
+        self.recommender.build(self.events, self.events_version)
+        self.timeline.build(self.events, self.events_version)
+        self.events_updated_at = datetime.now(timezone.utc).replace(microsecond=0)
+        self.ics_cache = {}
+
+    def _seed_digest(self) -> Optional[str]:
+        """
+        Content hash of the seed events file. None when there is no separate seed: outside
+        Vercel uploads are written back to the same file, so it is not a deploy-time input.
+        """
+        if SEED_DATA_FILE == DATA_FILE or not os.path.exists(SEED_DATA_FILE):
+            return None
+        with open(SEED_DATA_FILE, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+
+    def _snapshot_hash(self, snapshot) -> str:
+        """Content hash identifying a published event set."""
+        canonical = json.dumps(snapshot, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def publish_snapshot(self) -> Optional[str]:
+        """
+        Publish the current event set to Blob so other instances pick it up.
+        The snapshot is immutable and content-addressed; only the small pointer is overwritten.
+        """
+        try:
+            snapshot = {
+                "eventsVersion": self.events_version,
+                "changelog": self.changelog,
+                "events": self.events
+            }
+            version = self._snapshot_hash(snapshot)
+            snapshot_url = self.blob_storage.put(
+                f"{EVENTS_SNAPSHOT_PREFIX}{version}.json",
+                json.dumps(snapshot, ensure_ascii=False),
+                add_random_suffix=False, allow_overwrite=True
+            )
+            if not snapshot_url:
+                return None
+
+            pointer = {
+                "version": version,
+                "url": snapshot_url,
+                "count": len(self.events),
+                "eventsVersion": self.events_version,
+                "seedDigest": self.seed_digest,
+                "publishedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            }
+            # Short CDN cache on the pointer; snapshots themselves never change
+            self.blob_storage.put(EVENTS_POINTER_KEY, json.dumps(pointer),
+                                  add_random_suffix=False, allow_overwrite=True, cache_max_age=60)
+            self.snapshot_version = version
+            return version
+        except Exception as e:
+            print(f"Error publishing event snapshot: {e}")
+            return None
+
+    def sync_due(self) -> bool:
+        """True once EVENTS_SYNC_INTERVAL has passed since the last pointer check."""
+        return time.monotonic() - self._last_sync_check >= EVENTS_SYNC_INTERVAL
+
+    def sync_events(self, force: bool = False) -> bool:
+        """
+        Swap in the published event set if another instance uploaded a newer one.
+        The pointer is checked at most once per EVENTS_SYNC_INTERVAL seconds.
+
+        A fresh instance whose seed events file differs from the one the published set
+        was built from (a redeploy with an edited seed) republishes its seed instead of
+        adopting the older upload. Pointers published before seeds were recorded are
+        always adopted.
+        Returns True if the local events were replaced.
+        """
+        now = time.monotonic()
+        if not force and not self.sync_due():
+            return False
+        # Only one request per instance performs the check
+        if not self._sync_lock.acquire(blocking=False):
+            return False
+
+        try:
+            self._last_sync_check = now
+
+            # Listing the pointer is one small metadata call; its uploadedAt changes on every publish
+            blobs = self.blob_storage.list(prefix=EVENTS_POINTER_KEY)
+            meta = next((b for b in blobs if b.get("pathname") == EVENTS_POINTER_KEY), None)
+            if not meta:
+                return False
+
+            stamp = str(meta.get("uploadedAt") or meta.get("url"))
+            if stamp == self._pointer_stamp:
+                return False
+
+            # Bust the CDN cache so we read the pointer that was just listed
+            pointer = self.blob_storage.get_json(f"{meta['url']}?v={stamp}")
+            if not pointer or not pointer.get("version"):
+                return False
+            self._pointer_stamp = stamp
+
+            if pointer["version"] == self.snapshot_version:
+                return False
+
+            first_check, self._seed_checked = not self._seed_checked, True
+            published_seed = pointer.get("seedDigest")
+            if first_check and self.seed_digest and published_seed and published_seed != self.seed_digest:
+                print(f"Seed events changed since event set {pointer['version']}; republishing the seed")
+                # Always move past the published version, so no client sees it go backwards
+                self._new_version_base(floor=int(pointer.get("eventsVersion") or 0))
+                self._on_events_changed()
+                self._publish_shared()
+                self.publish_snapshot()
+                return False
+
+            snapshot = self.blob_storage.get_json(pointer["url"])
+            if isinstance(snapshot, list):
+                # Snapshots published before versioning are a bare event list
+                snapshot = {"events": snapshot}
+            if not isinstance(snapshot, dict) or not isinstance(snapshot.get("events"), list):
+                return False
+
+            events = snapshot["events"]
+            self.snapshot_version = pointer["version"]
+            self._adopt_event_set(events, snapshot.get("eventsVersion"), snapshot.get("changelog"))
+            self.save_data()
+            self._publish_shared()
+            print(f"Synced event set {pointer['version']} ({len(events)} events)")
+            return True
+        except Exception as e:
+            print(f"Error syncing event snapshot: {e}")
+            return False
+        finally:
+            self._sync_lock.release()
+
     def generate_id(self, event_name: str, start_date: str, location_raw: str) -> str:
         """Generate a stable, unique ID for an event."""
-        # Use location_raw as it's more stable than parsed city
-        clean_name = str(event_name).strip()
-        clean_date = str(start_date).strip()
-        clean_loc = str(location_raw).strip()
-        
-        id_str = f"{clean_name}_{clean_date}_{clean_loc}".replace(" ", "_")
-        # Remove characters that might be problematic in URLs or IDs
-        invalid_chars = '<>:"/\\|?*\'`'
-        for char in invalid_chars:
-            id_str = id_str.replace(char, "")
-        return id_str
+        return generate_id(event_name, start_date, location_raw)
 
     def save_data(self):
         os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
@@ -299,8 +911,12 @@ class DataManager:
         """Get lat/long for a location, with caching and rate limiting."""
         from backend.city_coords import get_coordinates
         
-        # Create cache key
-        cache_key = f"{city},{country},{raw_location}".lower().strip()
+        # Cache per canonical place, so every spelling of a venue/city is geocoded once.
+        # Events arrive with city/country already parsed at ingest, so only bare strings are parsed here.
+        if city or country:
+            cache_key = location_key(city, country)
+        else:
+            cache_key = normalize_location(raw_location).key or raw_location.lower().strip()
         
         if cache_key in self.geocache:
             return self.geocache[cache_key]
@@ -349,6 +965,7 @@ class DataManager:
 
     def re_geocode_all(self, force: bool = True) -> Dict:
         """Re-geocode all events (optionally only those missing coordinates)."""
+        previous = {e["id"]: dict(e) for e in self.events}
         geocoded_count = 0
         failed_count = 0
         failures = []
@@ -376,6 +993,10 @@ class DataManager:
                         })
         
         self.save_data()
+        self._record_change(previous)
+        self._on_events_changed()
+        self._publish_shared()
+        self.publish_snapshot()
         return {
             "geocoded": geocoded_count, 
             "failed": failed_count, 
@@ -384,180 +1005,71 @@ class DataManager:
         }
 
     def process_excel(self, file_content: bytes) -> Dict[str, str]:
+        # Start from the latest published set so the new version follows it
+        self.sync_events(force=True)
         try:
-            # Read Excel from bytes
-            df = pd.read_excel(file_content)
-            
-            # Normalize Headers for easier matching
-            
-            # Normalize Headers for easier matching
-            # logic: strip, lower. But we need to handle the unnamed one for links.
-            # Let's create a map of "Expected Name" -> "Actual Column Name in DF"
-            
-            col_map = {}
-            unnamed_link_col = None
+            # Read Excel from bytes (first sheet)
+            df = pd.read_excel(io.BytesIO(file_content))
 
-            for col in df.columns:
-                c_str = str(col).strip()
-                c_lower = c_str.lower()
-                
-                if "topic" in c_lower: col_map["topic"] = col
-                elif "event name" in c_lower or "eventname" in c_lower: col_map["eventName"] = col
-                elif "start date" in c_lower or "startdate" in c_lower: col_map["startDate"] = col
-                elif "end date" in c_lower or "enddate" in c_lower: col_map["endDate"] = col
-                elif "location" in c_lower: col_map["location"] = col
-                elif "agencies" in c_lower: col_map["agencies"] = col
-                elif "quarter" in c_lower: col_map["quarter"] = col
-                elif "fees" in c_lower or "price" in c_lower or "cost" in c_lower or "budget" in c_lower: col_map["price"] = col
-                elif c_str.startswith("Unnamed"): 
-                    # Assuming the unnamed column after location is the link
-                    # For safety, we might check if the content looks like a URL later, 
-                    # but for now let's just grab the first unnamed one or the one at index 6 if strictly ordered
-                    if unnamed_link_col is None: unnamed_link_col = col
-
-            # Fallback for Link if specific order is implied: 
-            # User said: Topic, Event name, Start date, End date, Quarter, Location, [LINK], Agencies
-            # Indexes: 0, 1, 2, 3, 4, 5, 6, 7
-            if len(df.columns) > 6 and "Unnamed" in str(df.columns[6]):
-                unnamed_link_col = df.columns[6]
-
-            def find_url_in_row(row):
-                """Search all columns in a row for something that looks like a URL."""
-                for val in row:
-                    v_str = str(val).strip()
-                    if v_str.startswith("http://") or v_str.startswith("https://") or "www." in v_str:
-                        return v_str
-                return ""
-
-            # Validation
-            # We strictly need Event Name and Start Date at minimum to display something useful?
-            # User error said "Missing required columns: city, country" previously.
-            # New required: Topic, Event name
-            
-            required_keys = ["topic", "eventName", "location"] 
-            missing = [k for k in required_keys if k not in col_map]
-            
-            if missing:
-                 # Be more lenient if we can't find keys but have enough columns? 
-                 # For now, return error to help user debug their sheet
-                return {"status": "error", "message": f"Could not find columns for: {', '.join(missing)}. Detected: {list(df.columns)}"}
-
-            new_events = []
-            for _, row in df.iterrows():
-                def get_val(key, default=""):
-                    if key in col_map and pd.notna(row[col_map[key]]):
-                        return str(row[col_map[key]]).strip()
-                    return default
-
-                # Date Parsing (DD-MM-YYYY)
-                def parse_date(date_str):
-                    if not date_str: return ""
-                    try:
-                        # Try standard formats
-                        # check if it's already datetime object from pandas
-                        if isinstance(row[col_map["startDate"]], datetime):
-                             return row[col_map["startDate"]].strftime("%Y-%m-%d")
-                        
-                        # String parsing
-                        # User specified mostly DD-MM-YYYY e.g. 08-10-2025
-                        # Pandas to_datetime is smart, let's try it with dayfirst=True
-                        dt = pd.to_datetime(date_str, dayfirst=True, errors='coerce')
-                        if pd.notna(dt):
-                            return dt.strftime("%Y-%m-%d")
-                        return str(date_str) 
-                    except:
-                        return str(date_str)
-
-                # Location Parsing (City/Country)
-                # Formats seen: "London, UK" or "Amsterdam Netherlands" or "Singapore"
-                raw_loc = get_val("location")
-                city = raw_loc
-                country = ""
-                
-                if "," in raw_loc:
-                    # Format: "City, Country"
-                    parts = raw_loc.split(",")
-                    city = parts[0].strip()
-                    country = parts[-1].strip()
-                elif "|" in raw_loc:
-                    # Format: "Property | City, Country"
-                    parts = raw_loc.split("|")
-                    city = parts[-1].strip() # Take the part after pipe as more specific city/country
-                    if "," in city:
-                        subparts = city.split(",")
-                        city = subparts[0].strip()
-                        country = subparts[-1].strip()
-                else:
-                    # Format: "City Country" or just "City"
-                    # Try to split by space and take last word as country if multiple words
-                    parts = raw_loc.strip().split()
-                    if len(parts) >= 2:
-                        # Heuristic: Last word might be country
-                        # Common countries: India, USA, UK, Japan, China, etc.
-                        potential_country = parts[-1]
-                        # If last part looks like a country (or has known patterns), split it
-                        if potential_country in ['India', 'USA', 'UK', 'Japan', 'China', 'Korea', 'France', 
-                                                  'Germany', 'Spain', 'Italy', 'Canada', 'Australia', 
-                                                  'Netherlands', 'Singapore', 'Malaysia', 'Taiwan',
-                                                  'Morocco', 'Sweden', 'Romania', 'UAE', 'UAE.']:
-                            city = ' '.join(parts[:-1])
-                            country = potential_country.rstrip('.')  # Remove trailing period
-                        else:
-                            city = raw_loc
-                            country = ""
-                    else:
-                        city = raw_loc
-                        country = ""
-                
-                # Link
-                link = ""
-                if unnamed_link_col and pd.notna(row[unnamed_link_col]):
-                    link = str(row[unnamed_link_col]).strip()
-                
-                # Fallback: if link is still empty or doesn't look like a URL, search all columns
-                if not link or not (link.startswith("http") or "www." in link):
-                    link = find_url_in_row(row)
-
-                start_date = parse_date(row.get(col_map.get("startDate")))
-                end_date = parse_date(row.get(col_map.get("endDate")))
-
-                # Geocode the location - pass raw location for best results
-                coords = self.geocode_location(city, country, raw_loc)
-
-                event_id = self.generate_id(get_val('eventName'), start_date, raw_loc)
-
-                event = {
-                    "id": event_id,
-                    "eventName": get_val("eventName"),
-                    "topic": get_val("topic"),
-                    "startDate": start_date,
-                    "endDate": end_date,
-                    "city": city,
-                    "country": country,
-                    "location_raw": raw_loc, # Store original
-                    "quarter": get_val("quarter"),
-                    "organizer": get_val("agencies"), # Mapping Agencies -> Organizer
-                    "registrationUrl": link if link else "#",
-                    "description": "", # No description column mentioned?
-                    "tags": "",
-                    "price": get_val("price", "TBD"), # Store as price
-                    "lat": coords["lat"] if coords else None,
-                    "lng": coords["lng"] if coords else None
-                }
-                new_events.append(event)
-            
-            # Replace local events with new events
-            self.events = new_events
-            
-            self.save_data()
-            return {
+            new_events, error = parse_sheet(df)
+            if error:
+                # Return error to help user debug their sheet
+                return {"status": "error", "message": error}
+
+            self._replace_events(new_events)
+            result = {
                 "status": "success", 
                 "message": f"Database Refreshed: Processed {len(new_events)} rows. Total events in system: {len(self.events)}."
             }
+            flagged = unparsed_dates(new_events)
+            if flagged:
+                result["message"] += f" {len(flagged)} row(s) have dates that could not be parsed."
+                result["unparsedDates"] = flagged
+            return result
 
         except Exception as e:
             return {"status": "error", "message": f"Processing Error: {str(e)}"}
 
+    def process_workbooks(self, files: List[Tuple[str, bytes]]) -> Dict:
+        """
+        Replace the event set from several workbooks and/or zips of workbooks.
+        Every sheet is parsed (in parallel), results are merged by event id, and
+        the response carries a per-sheet report for each source file.
+        """
+        self.sync_events(force=True)
+        try:
+            new_events, report = parse_workbooks(files)
+        except Exception as e:
+            return {"status": "error", "message": f"Processing Error: {str(e)}"}
+
+        if not new_events:
+            return {"status": "error", "message": "No events found in the uploaded files.", "report": report}
+
+        self._replace_events(new_events)
+        return {
+            "status": "success",
+            "message": f"Database Refreshed: Processed {len(new_events)} unique events from {len(report)} file(s).",
+            "report": report
+        }
+
+    def _replace_events(self, new_events: List[Dict]):
+        """Geocode freshly parsed events and make them the current event set."""
+        for event in new_events:
+            # Geocode the location - pass raw location for best results
+            coords = self.geocode_location(event["city"], event["country"], event["location_raw"])
+            event["lat"] = coords["lat"] if coords else None
+            event["lng"] = coords["lng"] if coords else None
+
+        # Replace local events with new events
+        previous = {e["id"]: e for e in self.events}
+        self.events = new_events
+
+        self.save_data()
+        self._record_change(previous)
+        self._on_events_changed()
+        self._publish_shared()
+        self.publish_snapshot()
+
     def get_events(self, filters: Optional[Dict] = None) -> List[Dict]:
         if not filters:
             return self.events
@@ -586,4 +1098,135 @@ class DataManager:
         
         return {k: sorted(list(v)) for k, v in options.items()}
 
-data_manager = DataManager()
+    def get_event_clusters(self, bbox: str, zoom: int) -> Dict:
+        """Map marker clusters for the visible bounding box at a zoom level."""
+        parsed = parse_bbox(bbox)
+        if parsed is None:
+            return {"status": "error", "message": "bbox must be 'west,south,east,north'"}
+        return self.cluster_index.query(parsed, zoom)
+
+    def get_events_near(self, lat: Optional[float] = None, lng: Optional[float] = None,
+                        radius_km: float = 500, city: str = "", limit: Optional[int] = None) -> Dict:
+        """Events within radius_km of a point (or of a known city), nearest first."""
+        if lat is None or lng is None:
+            from backend.city_coords import get_coordinates
+
+            coords = get_coordinates(city) if city else None
+            if not coords:
+                return {"status": "error", "message": "Provide lat/lng or a known city"}
+            lat, lng = coords["lat"], coords["lng"]
+
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return {"status": "error", "message": "lat/lng out of range"}
+        if not (0 < radius_km < float("inf")):
+            return {"status": "error", "message": "radius_km must be positive"}
+        if limit is not None and limit < 1:
+            return {"status": "error", "message": "limit must be at least 1"}
+
+        events = self.spatial_index.near(lat, lng, radius_km, limit)
+        return {"version": self.events_version, "count": len(events), "events": events}
+
+    def get_events_in_bbox(self, bbox: str) -> Dict:
+        """Events whose coordinates fall inside a 'west,south,east,north' bbox."""
+        parsed = parse_bbox(bbox)
+        if parsed is None:
+            return {"status": "error", "message": "bbox must be 'west,south,east,north'"}
+
+        events = self.spatial_index.within_bbox(*parsed)
+        return {"version": self.events_version, "count": len(events), "events": events}
+
+    def search_events(self, query: str, limit: int = 20) -> Dict:
+        """Ranked full-text search over event name, topic, organizer and location."""
+        if limit < 1 or limit > 100:
+            return {"status": "error", "message": "limit must be between 1 and 100"}
+        results = self.search_index.search(query, limit)
+        return {"version": self.events_version, "count": len(results), "results": results}
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> Dict:
+        """Typeahead suggestions for a filter field."""
+        if field not in SUGGEST_FIELDS:
+            return {"status": "error", "message": f"field must be one of: {', '.join(SUGGEST_FIELDS)}"}
+        if limit < 1 or limit > 100:
+            return {"status": "error", "message": "limit must be between 1 and 100"}
+        return {"field": field, "suggestions": self.search_index.suggest(field, prefix, limit)}
+
+    def _topic_counts(self, email: str) -> Dict[str, int]:
+        """Topics of one user's past interests, from the cube (kept current on writes)."""
+        try:
+            return self._fresh_interest_cube().topic_counts(email)
+        except BlobStorageError:
+            # Recommendations still work on distance alone while Blob is down
+            return {}
+
+    def get_recommendations(self, city: str = "", country: str = "", email: str = "", limit: int = 10) -> Dict:
+        """
+        Upcoming events ranked for a user: near their city (static table / geocode cache,
+        never an online lookup) and, for admin callers only, on the topics of a user's past
+        interests. The response has the same shape whether or not the email has interests,
+        so it does not reveal whether an address is registered.
+        """
+        from backend.city_coords import get_coordinates
+
+        if limit < 1 or limit > 100:
+            return {"status": "error", "message": "limit must be between 1 and 100"}
+
+        coords = None
+        if city:
+            key = normalize_location(f"{city}, {country}" if country else city).key
+            coords = self.geocache.get(key) or get_coordinates(city)
+
+        if not coords and not email:
+            return {"status": "error", "message": "Provide a known city"}
+        topic_counts = self._topic_counts(email) if email else {}
+
+        events = self.recommender.recommend(
+            coords["lat"] if coords else None, coords["lng"] if coords else None,
+            topic_counts, limit=limit
+        )
+        return {"version": self.events_version, "located": coords is not None, "count": len(events), "events": events}
+
+    def get_upcoming_events(self, days: int = 30) -> Dict:
+        """Events running between today and `days` days from now, in date order."""
+        if days < 0 or days > 3660:
+            return {"status": "error", "message": "days must be between 0 and 3660"}
+        events = self.timeline.upcoming(days)
+        return {"version": self.events_version, "days": days, "count": len(events), "events": events}
+
+    def get_quarter_events(self, quarter: str) -> Dict:
+        """Events starting in a calendar quarter ('Q2', 'Q2 2026', '2026-Q2'); bare quarters mean this year."""
+        parsed = parse_quarter(quarter, date.today().year)
+        if parsed is None:
+            return {"status": "error", "message": "quarter must look like 'Q2', 'Q2-2026' or '2026-Q2'"}
+        year, q = parsed
+        events = self.timeline.quarter(year, q)
+        return {"version": self.events_version, "quarter": f"Q{q} {year}", "count": len(events), "events": events}
+
+    def get_calendar_feed(self, topic: str = "", country: str = "", quarter: str = "") -> Dict:
+        """
+        iCalendar feed for the (optionally filtered) event set.
+        Rendered once per filter and cached (up to ICS_CACHE_SIZE filters) until the events change.
+        Returns: { 'body', 'etag', 'last_modified' }
+        """
+        # Key on the filters as filter_events compares them, not the raw query strings
+        key = (topic.strip().lower(), country.strip().lower(), quarter.strip().lower())
+        feed = self.ics_cache.get(key)
+        if feed is None:
+            events = filter_events(self.events, *key)
+            # Name from the key (not the raw query) so every caller sharing the entry gets the same
+            # feed: the data's own spelling of topic/country, an upper-cased quarter
+            sample = events[0] if events else {}
+            parts = [str(sample.get(field) or value).strip() if value else ""
+                     for field, value in (("topic", key[0]), ("country", key[1]))] + [key[2].upper()]
+            name = " / ".join(p for p in parts if p) or "All Events"
+            body = render_calendar(events, f"Conference Calendar - {name}", self.events_updated_at)
+            feed = {
+                "body": body,
+                "etag": '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"',
+                "last_modified": self.events_updated_at
+            }
+            if len(self.ics_cache) >= ICS_CACHE_SIZE:
+                self.ics_cache.pop(next(iter(self.ics_cache)))
+            self.ics_cache[key] = feed
+        return feed
+
+data_manager = DataManager()
\ No newline at end of file
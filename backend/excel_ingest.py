@@ -0,0 +1,247 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+import pandas as pd
+
+from backend.location_normalizer import normalize_location
+from backend.timeline_index import parse_ordinal
+
+# Worker processes for multi-sheet ingest (0 = one per core)
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "0"))
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+REQUIRED_KEYS = ["topic", "eventName", "location"]
+
+
+def generate_id(event_name: str, start_date: str, location_raw: str) -> str:
+    """Generate a stable, unique ID for an event."""
+    # Use location_raw as it's more stable than parsed city
+    clean_name = str(event_name).strip()
+    clean_date = str(start_date).strip()
+    clean_loc = str(location_raw).strip()
+
+    id_str = f"{clean_name}_{clean_date}_{clean_loc}".replace(" ", "_")
+    # Remove characters that might be problematic in URLs or IDs
+    invalid_chars = '<>:"/\\|?*\'`'
+    for char in invalid_chars:
+        id_str = id_str.replace(char, "")
+    return id_str
+
+
+def detect_columns(columns) -> Tuple[Dict[str, str], Optional[str]]:
+    """Map expected fields to the sheet's actual column names; also returns the unnamed link column."""
+    col_map = {}
+    unnamed_link_col = None
+
+    for col in columns:
+        c_str = str(col).strip()
+        c_lower = c_str.lower()
+
+        if "topic" in c_lower: col_map["topic"] = col
+        elif "event name" in c_lower or "eventname" in c_lower: col_map["eventName"] = col
+        elif "start date" in c_lower or "startdate" in c_lower: col_map["startDate"] = col
+        elif "end date" in c_lower or "enddate" in c_lower: col_map["endDate"] = col
+        elif "location" in c_lower: col_map["location"] = col
+        elif "agencies" in c_lower: col_map["agencies"] = col
+        elif "quarter" in c_lower: col_map["quarter"] = col
+        elif "fees" in c_lower or "price" in c_lower or "cost" in c_lower or "budget" in c_lower: col_map["price"] = col
+        elif c_str.startswith("Unnamed"):
+            # Assuming the unnamed column after location is the link
+            if unnamed_link_col is None: unnamed_link_col = col
+
+    # Fallback for Link if specific order is implied:
+    # Topic, Event name, Start date, End date, Quarter, Location, [LINK], Agencies
+    if len(columns) > 6 and "Unnamed" in str(columns[6]):
+        unnamed_link_col = columns[6]
+
+    return col_map, unnamed_link_col
+
+
+def parse_date(value) -> str:
+    """Dates come as datetimes or as DD-MM-YYYY strings; returns YYYY-MM-DD where possible."""
+    if value is None or (isinstance(value, str) and not value): return ""
+    try:
+        # check if it's already datetime object from pandas
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d")
+        dt = pd.to_datetime(value, dayfirst=True, errors='coerce')
+        if pd.notna(dt):
+            return dt.strftime("%Y-%m-%d")
+        return str(value)
+    except Exception:
+        return str(value)
+
+
+def unparsed_dates(events: List[Dict]) -> List[Dict]:
+    """Rows whose start or end date did not parse to YYYY-MM-DD (sheet row numbers, header is row 1)."""
+    flagged = []
+    for i, ev in enumerate(events):
+        bad = [field for field in ("startDate", "endDate")
+               if ev.get(field) and parse_ordinal(ev[field]) is None]
+        if bad or not ev.get("startDate"):
+            flagged.append({"row": i + 2, "eventName": ev.get("eventName", ""),
+                            **{field: ev.get(field, "") for field in ("startDate", "endDate")}})
+    return flagged
+
+
+def _find_url_in_row(row) -> str:
+    """Search all columns in a row for something that looks like a URL."""
+    for val in row:
+        v_str = str(val).strip()
+        if v_str.startswith("http://") or v_str.startswith("https://") or "www." in v_str:
+            return v_str
+    return ""
+
+
+def parse_sheet(df: pd.DataFrame) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Turn one sheet into event dicts (without coordinates; geocoding happens in the caller).
+    Returns (events, error); error is set when required columns cannot be found.
+    """
+    col_map, unnamed_link_col = detect_columns(df.columns)
+
+    missing = [k for k in REQUIRED_KEYS if k not in col_map]
+    if missing:
+        return [], f"Could not find columns for: {', '.join(missing)}. Detected: {list(df.columns)}"
+
+    events = []
+    for _, row in df.iterrows():
+        def get_val(key, default=""):
+            if key in col_map and pd.notna(row[col_map[key]]):
+                return str(row[col_map[key]]).strip()
+            return default
+
+        raw_loc = get_val("location")
+        # Memoised: rows sharing a venue are parsed once
+        location = normalize_location(raw_loc)
+
+        link = ""
+        if unnamed_link_col and pd.notna(row[unnamed_link_col]):
+            link = str(row[unnamed_link_col]).strip()
+        # Fallback: if link is still empty or doesn't look like a URL, search all columns
+        if not link or not (link.startswith("http") or "www." in link):
+            link = _find_url_in_row(row)
+
+        start_date = parse_date(row.get(col_map.get("startDate")))
+        end_date = parse_date(row.get(col_map.get("endDate")))
+
+        events.append({
+            "id": generate_id(get_val('eventName'), start_date, raw_loc),
+            "eventName": get_val("eventName"),
+            "topic": get_val("topic"),
+            "startDate": start_date,
+            "endDate": end_date,
+            "city": location.city,
+            "country": location.country,
+            "location_raw": raw_loc,  # Store original
+            "quarter": get_val("quarter"),
+            "organizer": get_val("agencies"),  # Mapping Agencies -> Organizer
+            "registrationUrl": link if link else "#",
+            "description": "",
+            "tags": "",
+            "price": get_val("price", "TBD"),
+            "lat": None,
+            "lng": None
+        })
+    return events, None
+
+
+def expand_sources(files: List[Tuple[str, bytes]]) -> Tuple[List[Tuple[str, bytes]], List[Dict]]:
+    """
+    Unpack uploaded files into (name, workbook bytes). Zips contribute every workbook inside them.
+    Returns (workbooks, errors) where errors are per-source entries for files that were skipped.
+    """
+    workbooks, errors = [], []
+    for name, content in files:
+        if name.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                    for member in archive.infolist():
+                        base = os.path.basename(member.filename)
+                        # Skip folders, macOS metadata and Excel lock files
+                        if member.is_dir() or base.startswith(("~$", "._")) or "__MACOSX" in member.filename:
+                            continue
+                        if base.lower().endswith(WORKBOOK_EXTENSIONS):
+                            workbooks.append((f"{name}/{member.filename}", archive.read(member)))
+            except zipfile.BadZipFile as e:
+                errors.append({"source": name, "error": f"Invalid zip archive: {e}"})
+        elif name.lower().endswith(WORKBOOK_EXTENSIONS):
+            workbooks.append((name, content))
+        else:
+            errors.append({"source": name, "error": "Unsupported file type (expected .xlsx, .xls or .zip)"})
+    return workbooks, errors
+
+
+def _parse_sheet_task(source: str, sheet: str, content: bytes) -> Tuple[str, str, List[Dict], Optional[str]]:
+    """Process-pool entry point: read one sheet of one workbook and parse it."""
+    try:
+        df = pd.read_excel(io.BytesIO(content), sheet_name=sheet)
+        events, error = parse_sheet(df)
+        return source, sheet, events, error
+    except Exception as e:
+        return source, sheet, [], f"Processing Error: {e}"
+
+
+def _pool_size(tasks: int) -> int:
+    workers = INGEST_WORKERS or os.cpu_count() or 1
+    return max(1, min(workers, tasks))
+
+
+def parse_workbooks(files: List[Tuple[str, bytes]]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Parse every sheet of every workbook (zips are expanded) in parallel across processes,
+    then merge the events, keeping the first occurrence of each generated id.
+    Returns (events, report) with one report entry per source file, listing its sheets.
+    """
+    workbooks, report = expand_sources(files)
+
+    tasks = []
+    sources: Dict[str, Dict] = {}
+    for name, content in workbooks:
+        entry = sources[name] = {"source": name, "sheets": []}
+        try:
+            sheets = pd.ExcelFile(io.BytesIO(content)).sheet_names
+        except Exception as e:
+            entry["error"] = f"Could not open workbook: {e}"
+            continue
+        tasks.extend((name, sheet, content) for sheet in sheets)
+
+    results = []
+    if len(tasks) > 1 and _pool_size(len(tasks)) > 1:
+        try:
+            # spawn: never fork the (threaded) server process
+            with ProcessPoolExecutor(max_workers=_pool_size(len(tasks)),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                results = list(pool.map(_parse_sheet_task, *zip(*tasks)))
+        except (OSError, RuntimeError) as e:
+            # Some serverless runtimes cannot start processes; parse in-process instead
+            print(f"Process pool unavailable, parsing sheets serially: {e}")
+            results = []
+    if not results:
+        results = [_parse_sheet_task(*task) for task in tasks]
+
+    merged: Dict[str, Dict] = {}
+    for source, sheet, events, error in results:
+        duplicates = 0
+        for event in events:
+            if event["id"] in merged:
+                duplicates += 1
+            else:
+                merged[event["id"]] = event
+        sheet_report = {"sheet": sheet, "rows": len(events), "duplicates": duplicates}
+        flagged = unparsed_dates(events)
+        if flagged:
+            # Kept, but left out of date views (upcoming/quarter) until fixed
+            sheet_report["unparsedDates"] = flagged
+        if error:
+            sheet_report["error"] = error
+        sources[source]["sheets"].append(sheet_report)
+
+    report.extend(sources.values())
+    return list(merged.values()), report
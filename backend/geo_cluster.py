@@ -0,0 +1,143 @@
+import math
+from typing import List, Dict, Optional, Tuple
+
+# Leaflet zoom levels are 0..18. Above MAX_CLUSTER_ZOOM we reuse the finest grid.
+MIN_CLUSTER_ZOOM = 0
+MAX_CLUSTER_ZOOM = 16
+
+# Member ids are only returned once the map is zoomed in this far
+MEMBER_IDS_ZOOM = 10
+
+# Roughly 4 grid cells across one 256px map tile
+CELLS_PER_TILE = 4
+
+# Most grid cells returned across the wider side of a bbox; finer zooms are clamped,
+# so an oversized bbox cannot request every event as its own cluster
+MAX_CELLS_ACROSS = 64
+
+
+def cell_size(zoom: int) -> float:
+    """Grid cell size in degrees for a given zoom level."""
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def parse_bbox(bbox: str) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Parse a Leaflet style bbox string "west,south,east,north".
+    Returns None if the string is malformed or has non-finite values.
+    """
+    try:
+        west, south, east, north = [float(p) for p in bbox.split(",")]
+    except (ValueError, AttributeError):
+        return None
+    # float() accepts 'nan' and 'inf', which the grid arithmetic cannot bucket
+    if not all(math.isfinite(v) for v in (west, south, east, north)):
+        return None
+
+    south, north = max(-90.0, min(south, north)), min(90.0, max(south, north))
+    return west, south, east, north
+
+
+def max_zoom_for_bbox(west: float, south: float, east: float, north: float) -> int:
+    """Finest zoom at which the bbox spans at most MAX_CELLS_ACROSS grid cells."""
+    width = east - west if west <= east else east + 360.0 - west
+    span = max(min(width, 360.0), north - south)
+    if span <= 0:
+        return MAX_CLUSTER_ZOOM
+    return max(MIN_CLUSTER_ZOOM, math.floor(math.log2(MAX_CELLS_ACROSS * 360.0 / (CELLS_PER_TILE * span))))
+
+
+class GeoClusterIndex:
+    """
+    Multi-resolution grid clustering of event coordinates.
+    For each zoom level, events are bucketed into a fixed grid of cells and
+    each non-empty cell keeps its count, centroid and member ids.
+    """
+    def __init__(self):
+        self.version = -1
+        # zoom -> {(ix, iy): {"count", "lat_sum", "lng_sum", "ids"}}
+        self.levels: Dict[int, Dict[Tuple[int, int], Dict]] = {}
+
+    def build(self, events: List[Dict], version: int = 0):
+        levels = {z: {} for z in range(MIN_CLUSTER_ZOOM, MAX_CLUSTER_ZOOM + 1)}
+
+        for ev in events:
+            lat, lng = ev.get("lat"), ev.get("lng")
+            if lat is None or lng is None:
+                continue
+
+            for zoom, cells in levels.items():
+                size = cell_size(zoom)
+                key = (math.floor((lng + 180.0) / size), math.floor((lat + 90.0) / size))
+                cell = cells.get(key)
+                if cell is None:
+                    cell = cells[key] = {"count": 0, "lat_sum": 0.0, "lng_sum": 0.0, "ids": []}
+                cell["count"] += 1
+                cell["lat_sum"] += lat
+                cell["lng_sum"] += lng
+                cell["ids"].append(ev.get("id"))
+
+        self.levels = levels
+        self.version = version
+
+    def _cells_in_bbox(self, zoom: int, west: float, south: float, east: float, north: float):
+        """Yield non-empty cells of a zoom level intersecting the bbox."""
+        cells = self.levels.get(zoom, {})
+        size = cell_size(zoom)
+        x_max = math.floor(360.0 / size)
+
+        y0 = math.floor((south + 90.0) / size)
+        y1 = math.floor((north + 90.0) / size)
+
+        # A bbox crossing the antimeridian (west > east) is split into two ranges
+        if west <= east:
+            x_ranges = [(west, east)]
+        else:
+            x_ranges = [(west, 180.0), (-180.0, east)]
+
+        for lo, hi in x_ranges:
+            x0 = max(0, math.floor((lo + 180.0) / size))
+            x1 = min(x_max, math.floor((hi + 180.0) / size))
+
+            # Walk the grid range if it is smaller than the set of non-empty cells,
+            # otherwise scan the non-empty cells directly.
+            if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+                for ix in range(x0, x1 + 1):
+                    for iy in range(y0, y1 + 1):
+                        cell = cells.get((ix, iy))
+                        if cell is not None:
+                            yield cell
+            else:
+                for (ix, iy), cell in cells.items():
+                    if x0 <= ix <= x1 and y0 <= iy <= y1:
+                        yield cell
+
+    def query(self, bbox: Tuple[float, float, float, float], zoom: int) -> Dict:
+        """
+        Return cluster centroids and counts for the visible bbox at a zoom level.
+        The grid is coarsened when the bbox is too large for the zoom (see max_zoom_for_bbox);
+        member ids are only included if the grid used is at MEMBER_IDS_ZOOM or finer.
+        """
+        requested_zoom = zoom
+        zoom = max(MIN_CLUSTER_ZOOM, min(int(zoom), MAX_CLUSTER_ZOOM, max_zoom_for_bbox(*bbox)))
+        include_ids = zoom >= MEMBER_IDS_ZOOM
+
+        clusters = []
+        for cell in self._cells_in_bbox(zoom, *bbox):
+            count = cell["count"]
+            cluster = {
+                "lat": round(cell["lat_sum"] / count, 6),
+                "lng": round(cell["lng_sum"] / count, 6),
+                "count": count
+            }
+            if include_ids:
+                cluster["ids"] = list(cell["ids"])
+            clusters.append(cluster)
+
+        return {
+            "version": self.version,
+            "zoom": requested_zoom,
+            "clusterZoom": zoom,
+            "total": sum(c["count"] for c in clusters),
+            "clusters": clusters
+        }
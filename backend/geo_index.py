@@ -0,0 +1,127 @@
+import math
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Bucket size of the spatial grid, in degrees
+GRID_CELL_DEG = 2.0
+
+# Approximate km per degree of latitude
+KM_PER_DEG_LAT = 111.32
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Vectorised great-circle distance (km) from one point to arrays of points."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - math.radians(lng)
+
+    a = np.sin(dlat / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Grid-bucketed spatial index over event coordinates.
+    Queries only touch the buckets overlapping the search area, then filter the
+    candidates with vectorised NumPy arithmetic.
+    """
+    def __init__(self):
+        self.version = -1
+        self.events: List[Dict] = []
+        self.lats = np.empty(0)
+        self.lngs = np.empty(0)
+        # (ix, iy) -> array of positions into self.lats / self.lngs / self.events
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor((lng + 180.0) / GRID_CELL_DEG), math.floor((lat + 90.0) / GRID_CELL_DEG))
+
+    def build(self, events: List[Dict], version: int = 0):
+        located = [ev for ev in events if ev.get("lat") is not None and ev.get("lng") is not None]
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, ev in enumerate(located):
+            buckets.setdefault(self._cell(ev["lat"], ev["lng"]), []).append(i)
+
+        self.events = located
+        self.lats = np.array([ev["lat"] for ev in located], dtype=np.float64)
+        self.lngs = np.array([ev["lng"] for ev in located], dtype=np.float64)
+        self.cells = {k: np.array(v, dtype=np.int64) for k, v in buckets.items()}
+        self.version = version
+
+    def _candidates(self, west: float, south: float, east: float, north: float) -> np.ndarray:
+        """Positions of events in grid cells overlapping the bbox."""
+        y0, y1 = self._cell(south, 0)[1], self._cell(north, 0)[1]
+
+        if west <= east:
+            x_ranges = [(west, east)]
+        else:
+            x_ranges = [(west, 180.0), (-180.0, east)]
+
+        chunks = []
+        for lo, hi in x_ranges:
+            x0, x1 = self._cell(0, max(-180.0, lo))[0], self._cell(0, min(180.0, hi))[0]
+            if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self.cells):
+                for ix in range(x0, x1 + 1):
+                    for iy in range(y0, y1 + 1):
+                        idx = self.cells.get((ix, iy))
+                        if idx is not None:
+                            chunks.append(idx)
+            else:
+                for (ix, iy), idx in self.cells.items():
+                    if x0 <= ix <= x1 and y0 <= iy <= y1:
+                        chunks.append(idx)
+
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def near(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Dict]:
+        """Events within radius_km of (lat, lng), nearest first, with a distanceKm field."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(lat))
+        south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+
+        # Near the poles (or for huge radii) the longitude span covers the globe
+        if north >= 90.0 or south <= -90.0 or cos_lat < 1e-6 or radius_km / (KM_PER_DEG_LAT * cos_lat) >= 180.0:
+            west, east = -180.0, 180.0
+        else:
+            dlng = radius_km / (KM_PER_DEG_LAT * cos_lat)
+            west, east = lng - dlng, lng + dlng
+            if west < -180.0:
+                west += 360.0
+            if east > 180.0:
+                east -= 360.0
+
+        idx = self._candidates(west, south, east, north)
+        if idx.size == 0:
+            return []
+
+        dist = haversine_km(lat, lng, self.lats[idx], self.lngs[idx])
+        mask = dist <= radius_km
+        idx, dist = idx[mask], dist[mask]
+
+        order = np.argsort(dist, kind="stable")
+        if limit:
+            order = order[:limit]
+
+        return [{**self.events[idx[o]], "distanceKm": round(float(dist[o]), 1)} for o in order]
+
+    def within_bbox(self, west: float, south: float, east: float, north: float) -> List[Dict]:
+        """Events whose coordinates fall inside the bbox."""
+        idx = self._candidates(west, south, east, north)
+        if idx.size == 0:
+            return []
+
+        lats, lngs = self.lats[idx], self.lngs[idx]
+        mask = (lats >= south) & (lats <= north)
+        if west <= east:
+            mask &= (lngs >= west) & (lngs <= east)
+        else:
+            mask &= (lngs >= west) | (lngs <= east)
+
+        return [self.events[i] for i in idx[mask]]
@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+PRODID = "-//Conference Calendar//Events Feed//EN"
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value per RFC 5545."""
+    return (str(text or "")
+            .replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Fold content lines longer than 75 octets."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+
+    parts = []
+    current = ""
+    limit = 75
+    for ch in line:
+        if len((current + ch).encode("utf-8")) > limit:
+            parts.append(current)
+            current = ch
+            limit = 74  # continuation lines start with a space
+        else:
+            current += ch
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _parse_day(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+
+def filter_events(events: List[Dict], topic: str = "", country: str = "", quarter: str = "") -> List[Dict]:
+    """Case-insensitive topic/country match; quarter matches 'Q2' or 'Q2 2026'."""
+    topic, country, quarter = topic.strip().lower(), country.strip().lower(), quarter.strip().lower()
+    result = []
+    for ev in events:
+        if topic and str(ev.get("topic", "")).strip().lower() != topic:
+            continue
+        if country and str(ev.get("country", "")).strip().lower() != country:
+            continue
+        if quarter and not str(ev.get("quarter", "")).strip().lower().startswith(quarter):
+            continue
+        result.append(ev)
+    return result
+
+
+def render_calendar(events: List[Dict], name: str, stamp: datetime) -> str:
+    """Render events as an iCalendar (VCALENDAR) document with all-day VEVENTs."""
+    dtstamp = stamp.strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+
+    for ev in events:
+        start = _parse_day(ev.get("startDate"))
+        if start is None:
+            continue
+        end = _parse_day(ev.get("endDate")) or start
+        if end < start:
+            end = start
+
+        uid = hashlib.sha1(str(ev.get("id", "")).encode("utf-8")).hexdigest()
+        location = ", ".join(p for p in [ev.get("city"), ev.get("country")] if p) or ev.get("location_raw", "")
+        url = ev.get("registrationUrl", "")
+
+        description = []
+        if ev.get("topic"):
+            description.append(f"Topic: {ev['topic']}")
+        if ev.get("organizer"):
+            description.append(f"Organizer: {ev['organizer']}")
+        if ev.get("price"):
+            description.append(f"Fees: {ev['price']}")
+        if url and url != "#":
+            description.append(f"Registration: {url}")
+
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:{uid}@conference-calendar",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+            # DTEND is exclusive for all-day events
+            f"DTEND;VALUE=DATE:{(end + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{_escape(ev.get('eventName', ''))}",
+            f"LOCATION:{_escape(location)}",
+            f"DESCRIPTION:{_escape(chr(10).join(description))}",
+        ])
+        if url and url != "#":
+            lines.append(f"URL:{url}")
+        if ev.get("topic"):
+            lines.append(f"CATEGORIES:{_escape(ev['topic'])}")
+        lines.append("END:VEVENT")
+
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
@@ -0,0 +1,176 @@
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+import pandas as pd
+
+# Dimensions of the analytics cube, in cell-key order
+DIMENSIONS = ["topic", "country", "role", "month"]
+
+UNKNOWN = "Unknown"
+
+
+def parse_fee(value) -> float:
+    """Parse an event price like '$1,200' or 'TBD' into a number (0 if unknown)."""
+    price_str = str(value if value is not None else "0").replace("$", "").replace(",", "")
+    try:
+        return float(price_str) if price_str.lower() != "tbd" else 0
+    except ValueError:
+        return 0
+
+
+def _cell_key(record: Dict) -> Tuple[str, str, str, str]:
+    month = str(record.get("timestamp") or "")[:7] or UNKNOWN
+    return (
+        str(record.get("topic") or UNKNOWN),
+        str(record.get("country") or UNKNOWN),
+        str(record.get("role") or UNKNOWN),
+        month
+    )
+
+
+def _email(record: Dict) -> str:
+    return str(record.get("email") or "").strip().lower()
+
+
+class InterestCube:
+    """
+    Precomputed interest counts and fee totals by topic x country x role x month,
+    plus per-user topic counts for recommendations.
+    Built once from all records with a pandas groupby, then kept current by
+    add()/remove() on writes; queries roll up the (small) set of cells.
+    Records are remembered by blob key, so a removal by key (discard()) needs no download.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (topic, country, role, month) -> [count, fees]
+        self.cells: Dict[Tuple[str, str, str, str], List[float]] = {}
+        # email -> {topic: number of interests}
+        self.profiles: Dict[str, Dict[str, int]] = {}
+        # blob key -> record counted in the cube
+        self.members: Dict[str, Dict] = {}
+        self.built_at: Optional[float] = None
+        # Set when a write raced the last build: counts may be off until the next rebuild
+        self.stale = False
+        # Bumped on every add/remove so a build that raced a write can be detected
+        self.write_count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def age(self) -> float:
+        return time.time() - self.built_at if self.built_at else float("inf")
+
+    def build(self, records: List[Dict], writes_at_start: Optional[int] = None,
+              keys: Optional[List[str]] = None):
+        """
+        Rebuild from all interest records (and their blob keys, parallel to records). Pass the
+        write_count read before fetching the records: if a write landed meanwhile, the cube is
+        marked stale so the next query rebuilds.
+        """
+        cells: Dict[Tuple[str, str, str, str], List[float]] = {}
+        if records:
+            df = pd.DataFrame(
+                [_cell_key(r) for r in records], columns=DIMENSIONS
+            )
+            df["fee"] = [parse_fee(r.get("eventPrice", "0")) for r in records]
+            grouped = df.groupby(DIMENSIONS, sort=False)["fee"].agg(["size", "sum"])
+            for key, row in zip(grouped.index, grouped.itertuples(index=False)):
+                cells[tuple(key)] = [int(row[0]), float(row[1])]
+
+        profiles: Dict[str, Dict[str, int]] = {}
+        for r in records:
+            topics = profiles.setdefault(_email(r), {})
+            topic = r.get("topic") or ""
+            topics[topic] = topics.get(topic, 0) + 1
+
+        with self._lock:
+            self.cells = cells
+            self.profiles = profiles
+            self.members = dict(zip(keys, records)) if keys else {}
+            raced = writes_at_start is not None and writes_at_start != self.write_count
+            self.built_at = time.time()
+            self.stale = raced
+
+    def add(self, record: Dict, sign: int = 1, key: Optional[str] = None):
+        """Apply one interest write (sign=1) or removal (sign=-1), stored at blob `key`, to the cube."""
+        with self._lock:
+            self.write_count += 1
+            if not self.ready:
+                return
+            if key is not None:
+                if sign > 0:
+                    if key in self.members:
+                        return  # already counted
+                    self.members[key] = record
+                elif self.members.pop(key, None) is None:
+                    return  # never counted
+            self._apply(record, sign)
+
+    def remove(self, record: Dict, key: Optional[str] = None):
+        self.add(record, sign=-1, key=key)
+
+    def discard(self, key: str):
+        """Remove the record stored at blob `key`, if the cube counted one."""
+        with self._lock:
+            self.write_count += 1
+            record = self.members.pop(key, None)
+            if record is not None and self.ready:
+                self._apply(record, -1)
+
+    def _apply(self, record: Dict, sign: int):
+        """Update cells and profiles for one record; caller holds the lock."""
+        key = _cell_key(record)
+        fee = parse_fee(record.get("eventPrice", "0"))
+        cell = self.cells.setdefault(key, [0, 0.0])
+        cell[0] += sign
+        cell[1] += sign * fee
+        if cell[0] <= 0:
+            del self.cells[key]
+
+        topics = self.profiles.setdefault(_email(record), {})
+        topic = record.get("topic") or ""
+        topics[topic] = topics.get(topic, 0) + sign
+        if topics[topic] <= 0:
+            del topics[topic]
+            if not topics:
+                del self.profiles[_email(record)]
+
+    def invalidate(self):
+        with self._lock:
+            self.cells = {}
+            self.profiles = {}
+            self.members = {}
+            self.built_at = None
+            self.stale = False
+
+    def topic_counts(self, email: str) -> Dict[str, int]:
+        """Topics of one user's interests, with how many interests each."""
+        with self._lock:
+            return dict(self.profiles.get(email.strip().lower(), {}))
+
+    def query(self, group_by: List[str]) -> Dict:
+        """Roll the cube up to the requested dimensions."""
+        with self._lock:
+            items = [(key, cell[0], cell[1]) for key, cell in self.cells.items()]
+
+        total_count = sum(c for _, c, _ in items)
+        total_fees = sum(f for _, _, f in items)
+
+        rows = []
+        if group_by and items:
+            df = pd.DataFrame([key for key, _, _ in items], columns=DIMENSIONS)
+            df["count"] = [c for _, c, _ in items]
+            df["fees"] = [f for _, _, f in items]
+            rolled = df.groupby(group_by, sort=True)[["count", "fees"]].sum().reset_index()
+            rolled = rolled.sort_values(["count", "fees"], ascending=False, kind="stable")
+            rows = [
+                {**{d: r[d] for d in group_by}, "count": int(r["count"]), "fees": float(r["fees"])}
+                for r in rolled.to_dict("records")
+            ]
+
+        return {
+            "group_by": group_by,
+            "rows": rows,
+            "total": {"count": int(total_count), "fees": float(total_fees)}
+        }
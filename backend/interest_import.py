@@ -0,0 +1,69 @@
+import io
+import json
+import re
+from typing import List, Dict
+
+import pandas as pd
+
+# Normalised column heading -> interest record field.
+# Accepts our own fields and the headings of the UserInterests.xlsx export.
+COLUMN_ALIASES = {
+    "firstname": "firstName",
+    "lastname": "lastName",
+    "username": "username",
+    "bhusername": "username",
+    "email": "email",
+    "bhemail": "email",
+    "role": "role",
+    "city": "city",
+    "country": "country",
+    "eventid": "eventId",
+    "eventname": "eventName",
+}
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+SPREADSHEET_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+
+def _field(heading) -> str:
+    normalised = re.sub(r"[^a-z0-9]", "", str(heading).lower())
+    return COLUMN_ALIASES.get(normalised, "")
+
+
+def _clean_row(raw: Dict) -> Dict:
+    row = {}
+    for heading, value in raw.items():
+        field = _field(heading)
+        if field and value is not None and not (isinstance(value, float) and pd.isna(value)):
+            row[field] = str(value).strip()
+    return row
+
+
+def parse_interest_rows(filename: str, content: bytes) -> List[Dict]:
+    """
+    Read interest rows from an NDJSON file (one JSON object per line) or a spreadsheet
+    (.xlsx/.xls/.csv). Returns one dict of known fields per row, in file order.
+    Raises ValueError for unreadable input; per-row problems are left to validation.
+    """
+    name = (filename or "").lower()
+    if name.endswith(NDJSON_EXTENSIONS):
+        rows = []
+        for number, line in enumerate(content.decode("utf-8-sig").splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {number} is not valid JSON: {e}") from e
+            if not isinstance(obj, dict):
+                raise ValueError(f"Line {number} is not a JSON object")
+            rows.append(_clean_row(obj))
+        return rows
+
+    if name.endswith(".csv"):
+        df = pd.read_csv(io.BytesIO(content), dtype=str)
+    elif name.endswith(SPREADSHEET_EXTENSIONS):
+        df = pd.read_excel(io.BytesIO(content), dtype=str)
+    else:
+        raise ValueError("Unsupported file type (expected .xlsx, .xls, .csv, .ndjson or .jsonl)")
+    return [_clean_row(r) for r in df.to_dict("records")]
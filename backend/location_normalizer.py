@@ -0,0 +1,130 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from backend.search_index import fold
+
+# Canonical country name -> aliases as they appear in the spreadsheets
+# (matched case-insensitively, ignoring trailing dots)
+COUNTRY_ALIASES = {
+    "USA": ["usa", "us", "u.s", "u.s.a", "united states", "united states of america"],
+    "UK": ["uk", "u.k", "united kingdom", "great britain", "england", "scotland"],
+    "UAE": ["uae", "u.a.e", "united arab emirates"],
+    "India": ["india"],
+    "Japan": ["japan"],
+    "China": ["china", "prc"],
+    "South Korea": ["korea", "south korea", "republic of korea"],
+    "France": ["france"],
+    "Germany": ["germany"],
+    "Spain": ["spain"],
+    "Italy": ["italy"],
+    "Canada": ["canada"],
+    "Australia": ["australia"],
+    "Netherlands": ["netherlands", "the netherlands", "holland"],
+    "Singapore": ["singapore"],
+    "Malaysia": ["malaysia"],
+    "Taiwan": ["taiwan"],
+    "Morocco": ["morocco"],
+    "Sweden": ["sweden"],
+    "Romania": ["romania"],
+    "Austria": ["austria"],
+    "Finland": ["finland"],
+    "Norway": ["norway"],
+    "Vietnam": ["vietnam", "viet nam"],
+    "Qatar": ["qatar"],
+    "Indonesia": ["indonesia"],
+    "Saudi Arabia": ["saudi arabia", "ksa"],
+}
+
+# Single-token countries that double as cities ("Singapore") keep the token as the city too
+CITY_STATES = {"Singapore"}
+
+
+def _alias_key(text: str) -> str:
+    return text.strip().rstrip(".").lower()
+
+
+_ALIAS_TO_COUNTRY = {
+    _alias_key(alias): country for country, aliases in COUNTRY_ALIASES.items() for alias in aliases
+}
+
+# A trailing country after whitespace: "Delhi India", "Tokyo Japan", "Dubai UAE."
+_TRAILING_COUNTRY = re.compile(
+    r"^(?P<rest>.+?)\s+(?P<country>"
+    + "|".join(re.escape(a) for a in sorted(_ALIAS_TO_COUNTRY, key=len, reverse=True))
+    + r")$",
+    re.IGNORECASE
+)
+# Trailing notes that are not part of the place: "Stockholm Sweden & Online"
+_ONLINE_SUFFIX = re.compile(r"\s*(?:&|\+|/|and)\s*(?:online|virtual|hybrid)$", re.IGNORECASE)
+# "(Moscone Center)" -> venue
+_PARENTHETICAL = re.compile(r"\s*\(([^)]*)\)")
+
+
+class NormalizedLocation(NamedTuple):
+    venue: str
+    city: str
+    country: str
+    key: str  # canonical "city|country" (accent/case folded), shared by all spellings of a place
+
+
+def canonical_country(text: str) -> str:
+    """Canonical country name for an alias, or '' if it is not a known country."""
+    return _ALIAS_TO_COUNTRY.get(_alias_key(text), "")
+
+
+def location_key(city: str, country: str) -> str:
+    """Canonical "city|country" key (accent/case folded) of an already parsed place."""
+    return f"{fold(city).strip()}|{fold(country).strip()}"
+
+
+def _clean(raw: str) -> str:
+    text = raw.replace("\xa0", " ")
+    text = re.sub(r"\s+", " ", text).strip().rstrip(".").strip()
+    return _ONLINE_SUFFIX.sub("", text)
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(raw: str) -> NormalizedLocation:
+    """
+    Parse a free-text location into (venue, city, country, key). Formats seen:
+    "London, UK", "Houston, TX, USA", "Amsterdam Netherlands", "Singapore (Marina Bay Sands)",
+    "Chancery Pavilion Hotel | Bangalore, India", "Osaka, Japan / Tokyo, Japan".
+    Memoised per distinct raw string.
+    """
+    text = _clean(str(raw or ""))
+    venue = ""
+
+    # Several places: keep the first
+    if " / " in text:
+        text = text.split(" / ")[0].strip()
+
+    # "Property | City, Country"
+    if "|" in text:
+        head, _, text = text.rpartition("|")
+        venue = head.strip()
+        text = text.strip()
+
+    notes = _PARENTHETICAL.findall(text)
+    if notes:
+        text = _PARENTHETICAL.sub("", text).strip()
+        venue = venue or notes[0].strip()
+
+    city, country = text, ""
+    if "," in text:
+        parts = [p.strip() for p in text.split(",") if p.strip()]
+        city = parts[0] if parts else ""
+        if len(parts) > 1:
+            # Middle parts are states/regions ("Houston, TX, USA")
+            country = canonical_country(parts[-1]) or parts[-1]
+    elif canonical_country(text):
+        city, country = "", canonical_country(text)
+        if country in CITY_STATES:
+            city = country
+    else:
+        match = _TRAILING_COUNTRY.match(text)
+        if match:
+            city, country = match.group("rest").strip(), canonical_country(match.group("country"))
+
+    key = location_key(city, country) if (city or country) else fold(venue).strip()
+    return NormalizedLocation(venue, city, country, key)
@@ -1,8 +1,9 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import os
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, JSONResponse
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Optional, List, Dict
 from pydantic import BaseModel
 try:
@@ -11,7 +12,11 @@ try:
 except ImportError:
     pass
 
-from backend.data_manager import data_manager
+from backend.data_manager import data_manager, STORAGE_DIR
+from backend.blob_storage import BlobStorageError, BlobUnavailableError, BLOB_BREAKER_RESET
+from backend.static_assets import frontend_app
+from backend.interest_import import parse_interest_rows
+from backend.profiling import ProfilingMiddleware
 import pandas as pd
 import tempfile
 
@@ -24,17 +29,151 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Events-Version"],
 )
 
+# Blob outages surface as 503 (retry later) rather than as "no data" or a 400
+@app.exception_handler(BlobStorageError)
+async def blob_storage_error(request: Request, exc: BlobStorageError):
+    if isinstance(exc, BlobUnavailableError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Storage is temporarily unavailable. Please try again shortly."},
+            headers={"Retry-After": str(int(BLOB_BREAKER_RESET))}
+        )
+    return JSONResponse(status_code=502, content={"detail": "Storage request failed."})
+
+def degraded_headers() -> Dict[str, str]:
+    """Flags admin reads served from the last good snapshot during a Blob outage."""
+    status = data_manager.degraded_status()
+    if not status:
+        return {}
+    return {"X-Degraded-Mode": f"read-only; snapshot={status['snapshotAt'] or 'none'}"}
+
+# Pick up event sets uploaded on other workers (shared snapshot) and
+# other instances (blob snapshot, rate-limited inside sync_events)
+@app.middleware("http")
+async def sync_event_set(request: Request, call_next):
+    if request.url.path.startswith("/api"):
+        # Both checks are cheap; the parsing and Blob calls they lead to run off the event loop
+        if data_manager.shared_changed():
+            await run_in_threadpool(data_manager.refresh_shared)
+        if data_manager.sync_due():
+            await run_in_threadpool(data_manager.sync_events)
+    return await call_next(request)
+
+# Admin requests with ?profile=1 (or profile=folded) and the passphrase are sampled into
+# flamegraph-ready .folded files; outermost so event-set sync is included
+app.add_middleware(ProfilingMiddleware, passphrase="admin123", output_dir=os.path.join(STORAGE_DIR, "profiles"))
+
 # API Routes
 @app.get("/api/events")
-async def get_events():
+async def get_events(response: Response):
+    # Clients keep this version and later ask /api/events/changes for the delta
+    headers = {"X-Events-Version": str(data_manager.events_version)}
+    payload = data_manager.get_events_payload()
+    if payload is not None:
+        return Response(content=payload, media_type="application/json", headers=headers)
+    response.headers.update(headers)
     return data_manager.get_events()
 
+@app.get("/api/events/changes")
+async def get_event_changes(since: int):
+    return data_manager.get_event_changes(since)
+
+@app.get("/api/events/upcoming")
+async def get_upcoming_events(days: int = 30):
+    result = data_manager.get_upcoming_events(days)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/events/quarter/{quarter}")
+async def get_quarter_events(quarter: str):
+    result = data_manager.get_quarter_events(quarter)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/events/clusters")
+async def get_event_clusters(bbox: str, zoom: int):
+    result = data_manager.get_event_clusters(bbox, zoom)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/events/near")
+async def get_events_near(lat: Optional[float] = None, lng: Optional[float] = None,
+                          radius_km: float = 500, city: str = "", limit: Optional[int] = None):
+    result = data_manager.get_events_near(lat, lng, radius_km, city, limit)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/recommendations")
+async def get_recommendations(city: str = "", country: str = "", email: str = "", limit: int = 10,
+                              passphrase: Optional[str] = None):
+    # Personalising by email reveals that user's interests, so it is admin-only
+    ADMIN_SECRET = "admin123"
+    if email and passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    # Threadpool: the first call after the interest cube expires scans Blob
+    result = await run_in_threadpool(data_manager.get_recommendations, city, country, email, limit)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/events/bbox")
+async def get_events_in_bbox(bbox: str):
+    result = data_manager.get_events_in_bbox(bbox)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
 @app.get("/api/filters")
 async def get_filters():
     return data_manager.get_filter_options()
 
+@app.get("/api/search")
+async def search_events(q: str, limit: int = 20):
+    result = data_manager.search_events(q, limit)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/suggest")
+async def suggest(field: str, prefix: str = "", limit: int = 10):
+    result = data_manager.suggest(field, prefix, limit)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+@app.get("/api/calendar.ics")
+async def get_calendar(request: Request, topic: str = "", country: str = "", quarter: str = ""):
+    feed = data_manager.get_calendar_feed(topic, country, quarter)
+    headers = {
+        "ETag": feed["etag"],
+        "Last-Modified": format_datetime(feed["last_modified"], usegmt=True),
+        "Cache-Control": "public, max-age=300"
+    }
+
+    # Conditional GET: If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison (RFC 9110): a W/ prefix does not prevent a match
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        if feed["etag"] in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            if since >= feed["last_modified"]:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    return Response(content=feed["body"], media_type="text/calendar; charset=utf-8", headers=headers)
+
 @app.post("/api/admin/upload")
 async def upload_excel(file: UploadFile = File(...), passphrase: Optional[str] = None):
     # Basic security check
@@ -61,6 +200,22 @@ async def upload_excel(file: UploadFile = File(...), passphrase: Optional[str] =
     
     return result
 
+@app.post("/api/admin/upload/batch")
+async def upload_workbooks(files: List[UploadFile] = File(...), passphrase: Optional[str] = None):
+    """Replace events from several workbooks (every sheet) and/or zip archives of workbooks."""
+    ADMIN_SECRET = "admin123"
+    if passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Invalid Passphrase")
+
+    sources = [(f.filename or "upload.xlsx", await f.read()) for f in files]
+    # Sheets are parsed in worker processes; keep the event loop free meanwhile
+    result = await run_in_threadpool(data_manager.process_workbooks, sources)
+
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail={"message": result["message"], "report": result.get("report", [])})
+
+    return result
+
 @app.get("/api/admin/stats")
 async def get_stats(passphrase: str):
     ADMIN_SECRET = "admin123"
@@ -71,7 +226,9 @@ async def get_stats(passphrase: str):
     return {
         "total_events": len(events),
         "topics": len(set(e.get("topic") for e in events)),
-        "countries": len(set(e.get("country") for e in events))
+        "countries": len(set(e.get("country") for e in events)),
+        # Events left out of upcoming/quarter views because their start date does not parse
+        "undated_events": len(data_manager.timeline.undated)
     }
 
 @app.post("/api/admin/re-geocode")
@@ -126,12 +283,71 @@ async def clear_interests(request: Dict):
         
     return data_manager.remove_all_interests_for_event(event_name)
 
+@app.post("/api/admin/interests/migrate")
+async def migrate_interests(passphrase: str):
+    ADMIN_SECRET = "admin123"
+    if passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    
+    result = data_manager.migrate_interest_layout()
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result["message"])
+    return result
+
+@app.post("/api/admin/interests/bulk")
+async def bulk_import_interests(file: UploadFile = File(...), passphrase: Optional[str] = None):
+    """Register interests from a spreadsheet (.xlsx/.xls/.csv) or NDJSON file; returns a per-row report."""
+    ADMIN_SECRET = "admin123"
+    if passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    content = await file.read()
+    try:
+        rows = parse_interest_rows(file.filename or "", content)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
+
+    result = await run_in_threadpool(data_manager.bulk_save_interests, rows)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+class BulkRemovalRequest(BaseModel):
+    removals: List[RemoveInterestRequest]
+
+@app.post("/api/admin/interests/bulk/remove")
+async def bulk_remove_interests(request: BulkRemovalRequest, passphrase: str):
+    """Remove many (eventId, email) interests; returns a per-row report."""
+    ADMIN_SECRET = "admin123"
+    if passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    result = await run_in_threadpool(data_manager.bulk_remove_interests, [r.dict() for r in request.removals])
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
 @app.get("/api/admin/interests")
-async def get_interests(passphrase: str):
+async def get_interests(passphrase: str, response: Response):
     ADMIN_SECRET = "admin123"
     if passphrase != ADMIN_SECRET:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return data_manager.get_interests()
+    # Run in the threadpool so concurrent dashboards share one blob scan (single-flight)
+    data = await run_in_threadpool(data_manager.get_interests)
+    response.headers.update(degraded_headers())
+    return data
+
+@app.get("/api/admin/analytics")
+async def get_interest_analytics(passphrase: str, response: Response, group_by: str = ""):
+    ADMIN_SECRET = "admin123"
+    if passphrase != ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    
+    result = await run_in_threadpool(data_manager.get_interest_analytics, group_by)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    response.headers.update(degraded_headers())
+    return result
 
 @app.get("/api/admin/download-interests")
 async def download_interests(passphrase: str):
@@ -139,7 +355,7 @@ async def download_interests(passphrase: str):
     if passphrase != ADMIN_SECRET:
         raise HTTPException(status_code=401, detail="Unauthorized")
     
-    data = data_manager.get_interests()
+    data = await run_in_threadpool(data_manager.get_interests)
     
     if not data:
         df = pd.DataFrame(columns=["Event Name", "Fees", "No. of interests", "Total"])
@@ -159,9 +375,10 @@ async def download_interests(passphrase: str):
     tmp_path = os.path.join(tempfile.gettempdir(), "UserInterests_Summary.xlsx")
     df.to_excel(tmp_path, index=False)
         
-    return FileResponse(tmp_path, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', filename="UserInterests_Summary.xlsx")
+    return FileResponse(tmp_path, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', filename="UserInterests_Summary.xlsx", headers=degraded_headers())
 
 
 # Serve Frontend
 # This must be last to avoid catching API routes
-app.mount("/", StaticFiles(directory="frontend", html=True), name="static")
+# Built at startup: fingerprinted, precompressed assets (see backend/static_assets.py)
+app.mount("/", frontend_app(), name="static")
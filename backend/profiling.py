@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qs
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sampling interval of the profiler, in milliseconds
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(BASE_DIR):
+        path = os.path.relpath(path, BASE_DIR)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all threads at a fixed interval while running, keeping
+    only stacks that pass through this project's code (so idle workers and the idle
+    event loop are left out). Handlers run on the event loop or in threadpool
+    workers, so a per-thread profiler like cProfile would miss most of the work.
+    Output is the "folded" format read by flamegraph.pl, speedscope and inferno.
+    """
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000.0):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            in_project = False
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename.startswith(BASE_DIR):
+                    in_project = True
+                stack.append(_frame_label(code))
+                frame = frame.f_back
+            if in_project:
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+            self.sample_count += 1
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in profiling of admin requests: add `profile=1` (store the profile and
+    name it in the X-Profile-File header) or `profile=folded` (return the profile
+    instead of the normal response) next to a valid admin passphrase.
+
+    Plain ASGI middleware so requests without `profile=` pay only a substring check.
+    """
+    def __init__(self, app, passphrase: str, output_dir: str, path_prefix: str = "/api/admin"):
+        self.app = app
+        self.passphrase = passphrase
+        self.output_dir = output_dir
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or b"profile=" not in scope.get("query_string", b""):
+            return await self.app(scope, receive, send)
+
+        params = parse_qs(scope["query_string"].decode("latin-1"))
+        mode = params.get("profile", [""])[0]
+        if (mode not in ("1", "folded") or not scope["path"].startswith(self.path_prefix)
+                or params.get("passphrase", [""])[0] != self.passphrase):
+            return await self.app(scope, receive, send)
+
+        sampler = StackSampler()
+        status = {"code": 500}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            if mode == "folded":
+                return  # the profile replaces the response
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + pending_headers()
+            await send(message)
+
+        def pending_headers():
+            # Headers go out with the response start, so stop sampling there
+            sampler.stop()
+            path = self._store(scope["path"], sampler)
+            return [
+                (b"x-profile-file", os.path.basename(path).encode()),
+                (b"x-profile-samples", str(sampler.sample_count).encode()),
+            ]
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            # A failing handler is often the one worth profiling: still return its profile
+            if mode != "folded":
+                raise
+        finally:
+            if sampler.running:
+                sampler.stop()
+                if mode != "folded":
+                    self._store(scope["path"], sampler)
+
+        if mode == "folded":
+            body = sampler.folded().encode("utf-8")
+            filename = f"profile-{self._slug(scope['path'])}.folded"
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-disposition", f'attachment; filename="{filename}"'.encode()),
+                (b"x-profile-samples", str(sampler.sample_count).encode()),
+                (b"x-profiled-status", str(status["code"]).encode()),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _slug(path: str) -> str:
+        return path.strip("/").replace("/", "-") or "root"
+
+    def _store(self, path: str, sampler: StackSampler) -> str:
+        """Write the folded profile under output_dir; returns its path."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        out = os.path.join(self.output_dir, f"{stamp}-{self._slug(path)}.folded")
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+        print(f"Profile of {path}: {sampler.sample_count} samples over {sampler.elapsed:.2f}s -> {out}")
+        return out
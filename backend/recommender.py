@@ -0,0 +1,121 @@
+from datetime import date
+from typing import List, Dict, Optional, Iterable
+import numpy as np
+
+from backend.geo_index import EARTH_RADIUS_KM
+
+# Distance at which the proximity score has decayed to 1/e
+DISTANCE_SCALE_KM = 1500.0
+
+# Weights of proximity and topic affinity in the final score
+PROXIMITY_WEIGHT = 0.6
+AFFINITY_WEIGHT = 0.4
+
+# Events without a parseable end date sort last (treated as upcoming)
+_UNDATED = np.iinfo(np.int64).max
+
+
+def _end_ordinal(ev: Dict) -> int:
+    for field in ("endDate", "startDate"):
+        try:
+            return date.fromisoformat(str(ev.get(field) or "")[:10]).toordinal()
+        except ValueError:
+            continue
+    return _UNDATED
+
+
+def _unit_vectors(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    lat, lng = np.radians(lats), np.radians(lngs)
+    return np.stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+class Recommender:
+    """
+    Ranks upcoming events for a user by distance from their city and affinity to the
+    topics of their past interests.
+
+    build() precomputes, once per event-set version, arrays ordered by end date:
+    unit vectors of event coordinates (so distance is a dot product), topic codes and
+    end-date ordinals. "Upcoming" is then a contiguous suffix found with searchsorted,
+    and a query is a handful of vectorised operations plus an argpartition top-k.
+    """
+    def __init__(self):
+        self.version = -1
+        self.events: List[Dict] = []
+        self.ends = np.empty(0, dtype=np.int64)
+        self.xyz = np.empty((3, 0))
+        self.located = np.empty(0, dtype=bool)
+        self.topic_codes = np.empty(0, dtype=np.int64)
+        self.topics: Dict[str, int] = {}
+        self.positions: Dict[str, int] = {}
+
+    def build(self, events: List[Dict], version: int = 0):
+        ordered = sorted(events, key=_end_ordinal)
+        lats = np.array([ev["lat"] if ev.get("lat") is not None else np.nan for ev in ordered], dtype=np.float64)
+        lngs = np.array([ev["lng"] if ev.get("lng") is not None else np.nan for ev in ordered], dtype=np.float64)
+
+        topics: Dict[str, int] = {}
+        codes = [topics.setdefault(str(ev.get("topic") or "").strip().lower(), len(topics)) for ev in ordered]
+
+        self.located = ~(np.isnan(lats) | np.isnan(lngs))
+        self.xyz = np.ascontiguousarray(_unit_vectors(np.nan_to_num(lats), np.nan_to_num(lngs)))
+        self.ends = np.array([_end_ordinal(ev) for ev in ordered], dtype=np.int64)
+        self.topic_codes = np.array(codes, dtype=np.int64)
+        self.topics = topics
+        self.positions = {ev.get("id"): i for i, ev in enumerate(ordered)}
+        self.events = ordered
+        self.version = version
+
+    def recommend(self, lat: Optional[float] = None, lng: Optional[float] = None,
+                  topic_counts: Optional[Dict[str, int]] = None, exclude: Iterable[str] = (),
+                  limit: int = 10, today: Optional[date] = None) -> List[Dict]:
+        """
+        Top `limit` upcoming events, best first, each with its score and distance (km).
+        Without a location, ranks by topic affinity alone; without topics, by distance alone.
+        """
+        today = today or date.today()
+        start = int(np.searchsorted(self.ends, today.toordinal(), side="left"))
+        n = len(self.events) - start
+        if n <= 0 or limit <= 0:
+            return []
+
+        score = np.zeros(n)
+        distance = None
+        if lat is not None and lng is not None:
+            origin = _unit_vectors(np.array([lat]), np.array([lng]))[:, 0]
+            cos_angle = np.clip(origin @ self.xyz[:, start:], -1.0, 1.0)
+            distance = EARTH_RADIUS_KM * np.arccos(cos_angle)
+            proximity = np.exp(-distance / DISTANCE_SCALE_KM)
+            proximity[~self.located[start:]] = 0.0
+            score += PROXIMITY_WEIGHT * proximity
+
+        if topic_counts:
+            affinity = np.zeros(len(self.topics))
+            total = sum(topic_counts.values())
+            for topic, count in topic_counts.items():
+                code = self.topics.get(str(topic or "").strip().lower())
+                if code is not None:
+                    affinity[code] = count / total
+            # Scale so the user's favourite topic scores 1
+            if affinity.max() > 0:
+                affinity /= affinity.max()
+            score += AFFINITY_WEIGHT * affinity[self.topic_codes[start:]]
+
+        for event_id in exclude:
+            pos = self.positions.get(event_id)
+            if pos is not None and pos >= start:
+                score[pos - start] = -1.0
+
+        k = min(limit, n)
+        top = np.argpartition(-score, k - 1)[:k] if k < n else np.arange(n)
+        top = top[np.argsort(-score[top], kind="stable")]
+
+        results = []
+        for i in top:
+            if score[i] < 0:
+                continue
+            ev = self.events[start + i]
+            km = float(distance[i]) if distance is not None and self.located[start + i] else None
+            results.append({**ev, "score": round(float(score[i]), 4),
+                            "distance_km": round(km, 1) if km is not None else None})
+        return results
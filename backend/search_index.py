@@ -0,0 +1,202 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import List, Dict, Tuple
+import numpy as np
+
+# Text fields searched by /api/search, with their ranking weight
+SEARCH_FIELDS = {
+    "eventName": 3.0,
+    "topic": 2.0,
+    "organizer": 1.0,
+    "city": 1.0,
+    "country": 1.0,
+}
+
+# Fields available for typeahead via /api/suggest
+SUGGEST_FIELDS = ["topic", "city", "country", "tags", "eventName", "organizer"]
+
+# Cap on how many index terms a trailing prefix may expand to; the most frequent terms are kept
+MAX_PREFIX_EXPANSION = 64
+
+# Number of recent search results kept per event-set version
+SEARCH_CACHE_SIZE = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Case- and diacritic-fold text, e.g. 'CIGRÉ Vösendorf' -> 'cigre vosendorf'."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """[start, end) range of sorted keys starting with prefix."""
+    start = bisect_left(keys, prefix)
+    end = bisect_left(keys, prefix + "\uffff", lo=start)
+    return start, end
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over event text, plus sorted prefix tables for typeahead.
+    Built once per event-set version.
+    """
+    def __init__(self):
+        self.version = -1
+        self.events: List[Dict] = []
+        # token -> (sorted event positions, scores)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.terms: List[str] = []
+        # Document frequency of each term in self.terms, for picking prefix expansions
+        self.term_df = np.empty(0, dtype=np.int32)
+        # field -> sorted [(folded word-start suffix, display value)]
+        self.suggest_keys: Dict[str, List[str]] = {}
+        self.suggest_values: Dict[str, List[str]] = {}
+        # field -> {display value: number of events}
+        self.value_counts: Dict[str, Dict[str, int]] = {}
+        self._search_cache: Dict[Tuple[str, int], List[Dict]] = {}
+
+    def build(self, events: List[Dict], version: int = 0):
+        postings: Dict[str, Dict[int, float]] = {}
+        value_counts: Dict[str, Dict[str, int]] = {f: {} for f in SUGGEST_FIELDS}
+
+        for pos, ev in enumerate(events):
+            for field, weight in SEARCH_FIELDS.items():
+                for token in tokenize(ev.get(field) or ""):
+                    docs = postings.setdefault(token, {})
+                    docs[pos] = docs.get(pos, 0.0) + weight
+
+            for field in SUGGEST_FIELDS:
+                val = ev.get(field)
+                if not val:
+                    continue
+                values = [t.strip() for t in val.split(",")] if field == "tags" else [str(val).strip()]
+                counts = value_counts[field]
+                for v in values:
+                    if v:
+                        counts[v] = counts.get(v, 0) + 1
+
+        suggest_keys, suggest_values = {}, {}
+        for field, counts in value_counts.items():
+            entries = []
+            for value in counts:
+                folded = fold(value)
+                # Index every word start so "del" matches "New Delhi"
+                for m in _TOKEN_RE.finditer(folded):
+                    entries.append((folded[m.start():], value))
+            entries.sort()
+            suggest_keys[field] = [k for k, _ in entries]
+            suggest_values[field] = [v for _, v in entries]
+
+        self.events = events
+        self.postings = {
+            token: (np.fromiter(docs.keys(), dtype=np.int32, count=len(docs)),
+                    np.fromiter(docs.values(), dtype=np.float32, count=len(docs)))
+            for token, docs in postings.items()
+        }
+        self.terms = sorted(postings)
+        self.term_df = np.array([len(postings[t]) for t in self.terms], dtype=np.int32)
+        self.suggest_keys = suggest_keys
+        self.suggest_values = suggest_values
+        self.value_counts = value_counts
+        self._search_cache = {}
+        self.version = version
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Ranked full-text search. Every query token must match; the last token is
+        treated as a prefix so results update while typing.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        key = (" ".join(tokens), limit)
+        cached = self._search_cache.get(key)
+        if cached is None:
+            cached = self._search(tokens, limit)
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                self._search_cache.pop(next(iter(self._search_cache)))
+            self._search_cache[key] = cached
+        return cached
+
+    def _search(self, tokens: List[str], limit: int) -> List[Dict]:
+        per_token: List[Tuple[np.ndarray, np.ndarray]] = []
+        for token in tokens[:-1]:
+            docs = self.postings.get(token)
+            if docs is None:
+                return []
+            per_token.append(docs)
+
+        # Expand the trailing prefix into matching index terms
+        start, end = _prefix_range(self.terms, tokens[-1])
+        if start == end:
+            return []
+        positions = np.arange(start, end)
+        if end - start > MAX_PREFIX_EXPANSION:
+            # Keep the terms matching the most events (not the alphabetically first),
+            # so a short prefix like "p" still finds the common completions
+            top = np.argpartition(-self.term_df[start:end], MAX_PREFIX_EXPANSION - 1)[:MAX_PREFIX_EXPANSION]
+            positions = positions[top]
+            exact = bisect_left(self.terms, tokens[-1], lo=start, hi=end)
+            if exact < end and self.terms[exact] == tokens[-1] and exact not in positions:
+                positions = np.append(positions, exact)
+        ids, scores = [], []
+        for term in (self.terms[i] for i in positions.tolist()):
+            term_ids, term_scores = self.postings[term]
+            # Exact matches rank above prefix completions
+            ids.append(term_ids)
+            scores.append(term_scores if term == tokens[-1] else term_scores * 0.5)
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        order = np.lexsort((-scores, ids))
+        ids, scores = ids[order], scores[order]
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = ids[1:] != ids[:-1]
+        per_token.append((ids[first], scores[first]))
+
+        # Intersect starting from the rarest token
+        per_token.sort(key=lambda docs: len(docs[0]))
+        ids, scores = per_token[0]
+        for other_ids, other_scores in per_token[1:]:
+            pos = np.searchsorted(other_ids, ids)
+            pos[pos == len(other_ids)] = 0
+            hit = other_ids[pos] == ids
+            ids, scores = ids[hit], scores[hit] + other_scores[pos[hit]]
+            if ids.size == 0:
+                return []
+
+        if ids.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            ids, scores = ids[top], scores[top]
+
+        ranked = sorted(zip(ids.tolist(), scores.tolist()),
+                        key=lambda kv: (-kv[1], self.events[kv[0]].get("startDate", "")))
+        return [{**self.events[pos], "score": round(score, 2)} for pos, score in ranked]
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> List[Dict]:
+        """Typeahead values of a field matching a prefix, most common first."""
+        keys = self.suggest_keys.get(field)
+        if keys is None:
+            return []
+
+        folded = fold(prefix).strip()
+        if not folded:
+            counts = self.value_counts[field]
+            ranked = sorted(counts, key=lambda v: (-counts[v], v))
+            return [{"value": v, "count": counts[v]} for v in ranked[:limit]]
+
+        start, end = _prefix_range(keys, folded)
+        values = self.suggest_values[field]
+        matches = {values[i] for i in range(start, end)}
+
+        counts = self.value_counts[field]
+        # Values that start with the prefix rank above mid-word matches
+        ranked = sorted(matches, key=lambda v: (not fold(v).startswith(folded), -counts[v], v))
+        return [{"value": v, "count": counts[v]} for v in ranked[:limit]]
@@ -0,0 +1,157 @@
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker dev server, no cross-process locking needed
+    fcntl = None
+
+_GENERATION = struct.Struct("<Q")
+
+
+class SharedSnapshot:
+    """
+    Event set shared between worker processes through memory-mapped files.
+
+    Layout in `directory`:
+      <name>.gen         8-byte generation counter, mapped by every worker
+      <name>.<gen>.snap  one line of metadata JSON, then the events JSON array
+      <name>.lock        flock target serialising publishers
+
+    Publishing writes a new snapshot file and then bumps the counter. Workers compare
+    the counter (a plain memory read) against the generation they have mapped and
+    remap read-only when it moves. The serialised payload is served straight from the
+    mapping, so that copy lives once in the page cache; each worker still parses the
+    events for its own indexes.
+    """
+    def __init__(self, directory: str, name: str = "events"):
+        self.directory = directory
+        self.name = name
+        self.gen_path = os.path.join(directory, f"{name}.gen")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+
+        self.generation = 0  # generation currently mapped by this worker
+        self._snapshot: Optional[mmap.mmap] = None
+        self._events_offset = 0
+        self._counter: Optional[mmap.mmap] = None
+        # flock is per process: threads of one worker serialise on this lock first
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0  # only touched while holding _thread_lock
+        self._lock_file = None
+
+    def _path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{generation}.snap")
+
+    def _open_counter(self) -> mmap.mmap:
+        if self._counter is None:
+            os.makedirs(self.directory, exist_ok=True)
+            fd = os.open(self.gen_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < _GENERATION.size:
+                    os.ftruncate(fd, _GENERATION.size)
+                self._counter = mmap.mmap(fd, _GENERATION.size)
+            finally:
+                os.close(fd)
+        return self._counter
+
+    def current_generation(self) -> int:
+        return _GENERATION.unpack_from(self._open_counter(), 0)[0]
+
+    def changed(self) -> bool:
+        """True if another worker published a newer generation than the one mapped here."""
+        return self.current_generation() != self.generation
+
+    @contextmanager
+    def lock(self):
+        """Exclusive lock across workers and threads; re-entrant within a thread."""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_file = open(self.lock_path, "a+")
+                if fcntl:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _map(self, generation: int):
+        with open(self._path(generation), "rb") as f:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Previous mapping is released once no response still references it
+        self._snapshot = snapshot
+        self._events_offset = snapshot.find(b"\n") + 1
+        self.generation = generation
+
+    def publish(self, events: List[Dict], meta: Optional[Dict] = None) -> int:
+        """Write a new snapshot generation and make it visible to all workers."""
+        header = json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+        payload = json.dumps(events, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        with self.lock():
+            generation = self.current_generation() + 1
+            tmp_path = self._path(generation) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header + b"\n" + payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(generation))
+
+            counter = self._open_counter()
+            _GENERATION.pack_into(counter, 0, generation)
+            counter.flush()
+
+            # Keep the previous generation for workers that are mid-remap
+            for path in glob.glob(os.path.join(self.directory, f"{self.name}.*.snap")):
+                try:
+                    old = int(os.path.basename(path).split(".")[-2])
+                except ValueError:
+                    continue
+                if old < generation - 1:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+            self._map(generation)
+        return generation
+
+    def load(self) -> Optional[Tuple[List[Dict], Dict]]:
+        """Map the latest published generation. Returns (events, meta), or None if nothing is published."""
+        for _ in range(3):
+            generation = self.current_generation()
+            if generation == 0:
+                return None
+            try:
+                self._map(generation)
+                break
+            except FileNotFoundError:
+                # A publisher moved past this generation between reading the counter and opening
+                continue
+        else:
+            return None
+
+        meta = json.loads(self._snapshot[:self._events_offset - 1] or b"{}")
+        events = json.loads(self._snapshot[self._events_offset:])
+        return events, meta
+
+    def payload(self) -> Optional[memoryview]:
+        """
+        Events JSON of the mapped generation, ready to send as a response body.
+        A view of the mapping, not a copy; it keeps that generation mapped while in use.
+        """
+        if self._snapshot is None:
+            return None
+        return memoryview(self._snapshot)[self._events_offset:]
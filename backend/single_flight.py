@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution, and optionally
+    memoises the result for a short TTL. invalidate() drops memoised results and
+    detaches in-flight calls so later callers never see pre-write data.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._memo: Dict[str, Tuple[float, Any]] = {}
+        self._generation = 0
+
+    def do(self, key: str, fn: Callable[[], Any], ttl: float = 0.0) -> Any:
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None and memo[0] > time.monotonic():
+                return memo[1]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                generation = self._generation
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                    # Results of failed calls, or of calls overtaken by a write, are not memoised
+                    if call.error is None and ttl > 0 and generation == self._generation:
+                        self._memo[key] = (time.monotonic() + ttl, call.result)
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def invalidate(self):
+        with self._lock:
+            self._memo.clear()
+            self._calls.clear()
+            self._generation += 1
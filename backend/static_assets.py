@@ -0,0 +1,250 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from typing import Dict, Optional, Set
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker dev server, no cross-process locking needed
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
+
+# Vercel only allows writes to /tmp
+if "VERCEL" in os.environ:
+    BUILD_DIR = "/tmp/build/frontend"
+else:
+    BUILD_DIR = os.path.join(BASE_DIR, "build", "frontend")
+
+ASSETS_SUBDIR = "assets"
+
+# Precompressed variants written next to each compressible file
+VARIANT_EXTS = (".gz", ".br")
+
+# Text formats worth compressing; images are already compressed
+COMPRESSIBLE = {".js", ".css", ".html", ".svg", ".json", ".txt"}
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+def _fingerprint(name: str, content: bytes) -> str:
+    """'app.js' -> 'app.3f2a9c1b7d.js'"""
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    return f"{stem}.{digest}{ext}"
+
+
+def _rewrite(text: str, manifest: Dict[str, str], with_prefix: bool) -> str:
+    """
+    Point quoted/url() references at fingerprinted names, dropping cache-busting queries.
+    HTML and JS reference 'assets/<name>'; CSS inside assets/ references '<name>'.
+    """
+    prefix = f"{ASSETS_SUBDIR}/" if with_prefix else ""
+    for name, hashed in manifest.items():
+        pattern = r"(?<=[\"'(])" + re.escape(prefix + name) + r"(?:\?[^\"'()\s]*)?(?=[\"')])"
+        text = re.sub(pattern, prefix + hashed, text)
+    return text
+
+
+def _write_file(path: str, content: bytes):
+    # Write-then-rename so workers building concurrently never serve a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _write(path: str, content: bytes):
+    """Write a file plus .gz/.br variants for compressible types."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_file(path, content)
+
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE:
+        return
+    _write_file(path + ".gz", gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_file(path + ".br", brotli.compress(content, quality=11))
+
+
+def _source_digest(src: str) -> str:
+    """Hash of every source file (names and contents) plus the build options."""
+    digest = hashlib.sha256(f"brotli={brotli is not None}".encode())
+    for directory in (src, os.path.join(src, ASSETS_SUBDIR)):
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                digest.update(os.path.relpath(path, src).encode("utf-8") + b"\0")
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _prune(assets_out: str, keep: Set[str]):
+    """Remove fingerprints (and their variants) from earlier builds that are no longer referenced."""
+    for name in os.listdir(assets_out):
+        base, ext = os.path.splitext(name)
+        if ext not in VARIANT_EXTS:
+            base = name
+        if base in keep:
+            continue
+        try:
+            os.remove(os.path.join(assets_out, name))
+        except OSError:
+            pass
+
+
+def build_frontend(src: str = FRONTEND_DIR, out: str = BUILD_DIR) -> Dict[str, str]:
+    """
+    Build the served frontend into `out`:
+      - every file under assets/ is also written under a content-hashed name
+      - references in HTML/CSS/JS are rewritten to the hashed names
+      - text files get precompressed .gz (and .br if brotli is installed) variants
+      - fingerprints left over from earlier builds are removed
+    The build runs once per source change: workers serialise on a lock file and reuse
+    the manifest recorded next to `out` when the sources are unchanged.
+    Returns the manifest {original asset name: hashed name}.
+    """
+    # Lock and marker live beside `out`, so they are never served
+    os.makedirs(out, exist_ok=True)
+    marker_path = f"{out}.manifest.json"
+    with open(f"{out}.lock", "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            source = _source_digest(src)
+            try:
+                with open(marker_path, encoding="utf-8") as f:
+                    marker = json.load(f)
+                if marker.get("source") == source:
+                    return marker["manifest"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+            manifest = _build(src, out)
+            _write_file(marker_path, json.dumps({"source": source, "manifest": manifest}).encode("utf-8"))
+            return manifest
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _build(src: str, out: str) -> Dict[str, str]:
+    assets_src = os.path.join(src, ASSETS_SUBDIR)
+    assets_out = os.path.join(out, ASSETS_SUBDIR)
+
+    os.makedirs(assets_out, exist_ok=True)
+
+    names = sorted(n for n in os.listdir(assets_src) if os.path.isfile(os.path.join(assets_src, n)))
+    contents = {}
+    for name in names:
+        with open(os.path.join(assets_src, name), "rb") as f:
+            contents[name] = f.read()
+
+    # Binary assets first, so CSS/JS that reference them hash their rewritten content
+    manifest: Dict[str, str] = {}
+    text_exts = {".css", ".js"}
+    for name in [n for n in names if os.path.splitext(n)[1].lower() not in text_exts]:
+        manifest[name] = _fingerprint(name, contents[name])
+    for name in [n for n in names if os.path.splitext(n)[1].lower() in text_exts]:
+        text = contents[name].decode("utf-8")
+        text = _rewrite(text, manifest, with_prefix=name.endswith(".js"))
+        contents[name] = text.encode("utf-8")
+        manifest[name] = _fingerprint(name, contents[name])
+
+    _prune(assets_out, set(names) | set(manifest.values()))
+    for name in names:
+        _write(os.path.join(assets_out, manifest[name]), contents[name])
+        # Unhashed copy for pages or bookmarks that still reference the plain name
+        _write(os.path.join(assets_out, name), contents[name])
+
+    for name in os.listdir(src):
+        path = os.path.join(src, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if name.endswith(".html"):
+            content = _rewrite(content.decode("utf-8"), manifest, with_prefix=True).encode("utf-8")
+        _write(os.path.join(out, name), content)
+
+    return manifest
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves prebuilt .br/.gz variants when the client accepts them,
+    with immutable caching for fingerprinted assets and revalidation for everything else.
+    """
+    def __init__(self, *args, immutable: Optional[Set[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = immutable or set()
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        full_path = str(full_path)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+
+        headers = {
+            "Vary": "Accept-Encoding",
+            "Cache-Control": IMMUTABLE_CACHE if os.path.basename(full_path) in self.immutable else REVALIDATE_CACHE
+        }
+
+        path = full_path
+        for enc, ext in (("br", ".br"), ("gzip", ".gz")):
+            if enc in accepted and os.path.isfile(full_path + ext):
+                path = full_path + ext
+                stat_result = os.stat(path)
+                headers["Content-Encoding"] = enc
+                break
+
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result,
+                                media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def frontend_app() -> StaticFiles:
+    """Static app for the frontend; falls back to the raw directory if the build fails."""
+    try:
+        manifest = build_frontend()
+        return PrecompressedStaticFiles(directory=BUILD_DIR, html=True, immutable=set(manifest.values()))
+    except Exception as e:
+        print(f"Frontend build failed, serving unprocessed files: {e}")
+        return StaticFiles(directory=FRONTEND_DIR, html=True)
+
+
+if __name__ == "__main__":
+    for original, hashed in build_frontend().items():
+        print(f"{original} -> {hashed}")
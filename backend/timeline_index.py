@@ -0,0 +1,84 @@
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import List, Dict, Optional, Tuple
+
+_QUARTER = re.compile(r"^\s*(?:(\d{4})\s*[-\s]?\s*)?q([1-4])\s*(?:[-,\s]\s*(\d{4}))?\s*$", re.IGNORECASE)
+
+
+def parse_ordinal(value) -> Optional[int]:
+    """Ordinal of a 'YYYY-MM-DD' date string, or None if it does not parse."""
+    try:
+        return date.fromisoformat(str(value or "").strip()[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def parse_quarter(value: str, default_year: int) -> Optional[Tuple[int, int]]:
+    """'Q2', 'Q2 2026', 'Q2-2026', '2026-Q2' -> (2026, 2); None if not a quarter."""
+    match = _QUARTER.match(value or "")
+    if not match or (match.group(1) and match.group(3)):
+        return None
+    year = int(match.group(1) or match.group(3) or default_year)
+    return year, int(match.group(2))
+
+
+def quarter_key(year: int, quarter: int) -> str:
+    return f"{year}-Q{quarter}"
+
+
+class TimelineIndex:
+    """
+    Events sorted by parsed start date, with parallel start/end ordinals and
+    quarter buckets (contiguous runs of the sorted list). Time-window queries
+    are bisects plus a slice: O(log n + k).
+    Events whose start date does not parse are kept aside in `undated`.
+    """
+    def __init__(self):
+        self.version = -1
+        self.events: List[Dict] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.quarters: Dict[str, Tuple[int, int]] = {}
+        self.max_duration = 0
+        self.undated: List[Dict] = []
+
+    def build(self, events: List[Dict], version: int = 0):
+        dated, undated = [], []
+        for ev in events:
+            start = parse_ordinal(ev.get("startDate"))
+            if start is None:
+                undated.append(ev)
+                continue
+            end = parse_ordinal(ev.get("endDate"))
+            dated.append((start, max(start, end) if end is not None else start, ev))
+        dated.sort(key=lambda item: item[0])
+
+        self.starts = [s for s, _, _ in dated]
+        self.ends = [e for _, e, _ in dated]
+        self.events = [ev for _, _, ev in dated]
+        self.max_duration = max((e - s for s, e, _ in dated), default=0)
+
+        quarters: Dict[str, Tuple[int, int]] = {}
+        for i, start in enumerate(self.starts):
+            day = date.fromordinal(start)
+            key = quarter_key(day.year, (day.month - 1) // 3 + 1)
+            lo, _ = quarters.get(key, (i, i))
+            quarters[key] = (lo, i + 1)
+        self.quarters = quarters
+        self.undated = undated
+        self.version = version
+
+    def upcoming(self, days: int, today: Optional[date] = None) -> List[Dict]:
+        """Events running on any day from today through today+days (ongoing or starting), in date order."""
+        first = (today or date.today()).toordinal()
+        last = first + days
+        # Anything started more than max_duration days ago has already ended
+        lo = bisect_left(self.starts, first - self.max_duration)
+        hi = bisect_right(self.starts, last)
+        return [self.events[i] for i in range(lo, hi) if self.ends[i] >= first]
+
+    def quarter(self, year: int, quarter: int) -> List[Dict]:
+        """Events starting in a calendar quarter, in date order."""
+        lo, hi = self.quarters.get(quarter_key(year, quarter), (0, 0))
+        return self.events[lo:hi]
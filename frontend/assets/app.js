@@ -87,10 +87,47 @@ function initMap() {
 }
 
 // --- Data Fetching ---
+// Events are cached locally with the server's event-set version; returning users
+// only download the delta from /events/changes instead of the full list.
+const EVENTS_CACHE_KEY = 'eventsCache';
+
+function saveEventsCache(version, events) {
+    if (!version) return;
+    try {
+        localStorage.setItem(EVENTS_CACHE_KEY, JSON.stringify({ version: Number(version), events }));
+    } catch (err) {
+        console.warn("Could not cache events", err);
+    }
+}
+
+async function fetchEventSet() {
+    const cached = JSON.parse(localStorage.getItem(EVENTS_CACHE_KEY) || 'null');
+    if (cached && cached.version && Array.isArray(cached.events)) {
+        try {
+            const res = await fetch(`${API_BASE}/events/changes?since=${cached.version}`);
+            const delta = await res.json();
+            if (res.ok && !delta.full) {
+                const byId = new Map(cached.events.map(ev => [ev.id, ev]));
+                delta.removed.forEach(id => byId.delete(id));
+                [...delta.added, ...delta.updated].forEach(ev => byId.set(ev.id, ev));
+                const events = [...byId.values()];
+                saveEventsCache(delta.version, events);
+                return events;
+            }
+        } catch (err) {
+            console.warn("Delta sync failed, refetching all events", err);
+        }
+    }
+
+    const response = await fetch(`${API_BASE}/events`);
+    const data = await response.json();
+    saveEventsCache(response.headers.get('X-Events-Version'), data);
+    return data;
+}
+
 async function loadEvents() {
     try {
-        const response = await fetch(`${API_BASE}/events`);
-        const data = await response.json();
+        const data = await fetchEventSet();
         const today = new Date();
         today.setHours(0, 0, 0, 0);
 
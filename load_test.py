@@ -0,0 +1,256 @@
+"""
+Concurrent load test for the API.
+
+Runs the FastAPI app in-process (uvicorn on a local port) with an in-memory Blob
+store and a stub geocoder, so no network or Vercel token is needed, then drives
+mixed traffic and reports latency percentiles and throughput per route.
+
+    python load_test.py --concurrency 32 --duration 30 --blob-latency 40
+
+Because clients and server share one process, absolute numbers are pessimistic;
+compare runs against each other. A route whose latency climbs with concurrency
+while others stay flat usually means it blocks the event loop.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Keep the app off the real Blob store and the shared snapshot before it is imported
+os.environ["BLOB_READ_WRITE_TOKEN"] = ""
+os.environ.pop("SHARED_SNAPSHOT", None)
+
+import uvicorn
+from backend.blob_storage import CircuitBreaker
+from backend.main import app
+from backend.data_manager import data_manager
+
+PASSPHRASE = "admin123"
+
+# Relative weight of each kind of request: mostly public reads, some sign-ups, a few admin views
+MIX = {
+    "GET /api/events": 45,
+    "GET /api/filters": 25,
+    "POST /api/interest": 12,
+    "POST /api/interest/remove": 6,
+    "GET /api/admin/interests": 7,
+    "GET /api/admin/analytics": 5,
+}
+
+
+class FakeBlobStorage:
+    """In-memory stand-in for BlobStorage, with optional per-request latency."""
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.breaker = CircuitBreaker()
+        self.blobs = {}
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def url_for(self, pathname: str) -> str:
+        return f"https://fake.blob/{pathname.lstrip('/')}"
+
+    def put(self, filename, data, content_type="application/json",
+            add_random_suffix=True, allow_overwrite=False, cache_max_age=None):
+        self._wait()
+        url = self.url_for(filename)
+        with self._lock:
+            if add_random_suffix:
+                url = f"{url}-{len(self.blobs)}"
+            elif url in self.blobs and not allow_overwrite:
+                return None
+            self.blobs[url] = json.loads(data) if content_type == "application/json" else data
+        return url
+
+    def list(self, prefix=""):
+        self._wait()
+        with self._lock:
+            return [{"url": url, "pathname": url[len("https://fake.blob/"):]}
+                    for url in self.blobs if url.startswith(self.url_for(prefix))]
+
+    def head(self, url):
+        self._wait()
+        url = url if url.startswith("http") else self.url_for(url)
+        with self._lock:
+            return {"url": url} if url in self.blobs else None
+
+    def get_json(self, url):
+        self._wait()
+        with self._lock:
+            return self.blobs.get(url)
+
+    def delete(self, url):
+        return self.delete_many([url])
+
+    def delete_many(self, urls):
+        self._wait()
+        with self._lock:
+            for url in urls:
+                self.blobs.pop(url, None)
+        return True
+
+
+class StubGeocoder:
+    """Never calls Nominatim; unknown places simply stay ungeocoded."""
+    def geocode(self, query, timeout=None):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+class Traffic:
+    """Builds requests for each route; tracks registered interests so removals hit real ones."""
+    def __init__(self, base_url: str, events):
+        self.base_url = base_url
+        self.event_ids = [e["id"] for e in events]
+        self.registered = []
+        self.counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def send(self, session: requests.Session, route: str) -> requests.Response:
+        path = route.split(" ", 1)[1]
+        url = self.base_url + path
+
+        if path == "/api/interest":
+            n = next(self.counter)
+            body = {
+                "firstName": "Load", "lastName": f"Test{n}", "username": f"load{n}",
+                "email": f"load{n}@bakerhughes.com", "role": "Engineer",
+                "city": "Houston", "country": "USA",
+                "eventId": random.choice(self.event_ids), "confirmed": True, "consent": True
+            }
+            resp = session.post(url, json=body)
+            if resp.status_code == 200:
+                with self._lock:
+                    self.registered.append((body["eventId"], body["email"]))
+            return resp
+
+        if path == "/api/interest/remove":
+            with self._lock:
+                pair = self.registered.pop(random.randrange(len(self.registered))) if self.registered else None
+            if pair is None:
+                pair = (random.choice(self.event_ids), "nobody@bakerhughes.com")
+            return session.post(url, json={"eventId": pair[0], "email": pair[1]})
+
+        if path.startswith("/api/admin"):
+            return session.get(url, params={"passphrase": PASSPHRASE})
+        return session.get(url)
+
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def run(concurrency: int, duration: float, warmup: float, traffic: Traffic):
+    routes = list(MIX)
+    weights = [MIX[r] for r in routes]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    stop_at = time.monotonic() + warmup + duration
+    record_from = time.monotonic() + warmup
+
+    def worker():
+        session = requests.Session()
+        while True:
+            route = random.choices(routes, weights)[0]
+            started = time.monotonic()
+            if started >= stop_at:
+                return
+            try:
+                ok = traffic.send(session, route).status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = time.monotonic() - started
+            if started >= record_from:
+                with lock:
+                    latencies[route].append(elapsed)
+                    if not ok:
+                        errors[route] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+    for future in futures:
+        future.result()  # surface bugs in the harness itself
+    return latencies, errors
+
+
+def report(latencies, errors, duration: float):
+    header = f"{'route':<28}{'reqs':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(header)
+    print("-" * len(header))
+    total = 0
+    for route in MIX:
+        values = sorted(latencies.get(route, []))
+        total += len(values)
+        ms = [v * 1000 for v in values]
+        print(f"{route:<28}{len(values):>8}{errors.get(route, 0):>6}{len(values) / duration:>9.1f}"
+              f"{percentile(ms, 50):>9.1f}{percentile(ms, 95):>9.1f}{percentile(ms, 99):>9.1f}"
+              f"{(ms[-1] if ms else 0):>9.1f}")
+    all_ms = sorted(v * 1000 for values in latencies.values() for v in values)
+    print("-" * len(header))
+    print(f"{'all':<28}{total:>8}{sum(errors.values()):>6}{total / duration:>9.1f}"
+          f"{percentile(all_ms, 50):>9.1f}{percentile(all_ms, 95):>9.1f}{percentile(all_ms, 99):>9.1f}"
+          f"{(all_ms[-1] if all_ms else 0):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the conference calendar API")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before measuring")
+    parser.add_argument("--blob-latency", type=float, default=0, help="simulated Blob latency per call, in ms")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a repeatable mix")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    data_manager.blob_storage = FakeBlobStorage(latency=args.blob_latency / 1000.0)
+    data_manager.geocoder = StubGeocoder()
+
+    port = free_port()
+    server = start_server(port)
+    print(f"Load testing http://127.0.0.1:{port}: {args.concurrency} clients, "
+          f"{args.duration:.0f}s (+{args.warmup:.0f}s warmup), Blob latency {args.blob_latency:.0f}ms, "
+          f"{len(data_manager.events)} events")
+
+    traffic = Traffic(f"http://127.0.0.1:{port}", data_manager.events)
+    latencies, errors = run(args.concurrency, args.duration, args.warmup, traffic)
+    server.should_exit = True
+
+    report(latencies, errors, args.duration)
+    # Non-zero exit on server errors so the harness can gate CI
+    raise SystemExit(1 if sum(errors.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()